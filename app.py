@@ -69,6 +69,16 @@ current_theme = inject_theme(st.session_state.theme, st.session_state.custom_the
 # =============================================================================
 # Helper Functions
 # =============================================================================
+@st.cache_resource
+def get_tle_cache():
+    """Shared TLE cache for live fetches (None when Redis support is unavailable)."""
+    try:
+        from cache_manager import TLECacheManager
+    except ImportError:
+        return None
+    return TLECacheManager()
+
+
 def get_lat_lon(city_name):
     """Get coordinates from city name using Nominatim API"""
     url = f"https://nominatim.openstreetmap.org/search?q={city_name}&format=json&limit=1"
@@ -437,7 +447,7 @@ with tab1:
             with st.spinner("🛰️ Fetching live data from Space-Track and computing analysis..."):
                 try:
                     # Initialize agent
-                    agent = OrbitGuardAI(threshold_km=collision_threshold)
+                    agent = OrbitGuardAI(threshold_km=collision_threshold, cache=get_tle_cache())
                     
                     # Fetch TLEs live
                     agent.fetch_tles(
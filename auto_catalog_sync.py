@@ -13,6 +13,7 @@ import logging
 from database_manager import DatabaseManager
 from orbit_agent_async import AsyncOrbitAgent
 from cache_manager import TLECacheManager
+from tle_parser import parse_tle_batch
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +104,10 @@ class AutoCatalogSync:
             # Process and insert satellites
             satellites_to_insert = []
             
-            for tle_entry in catalog:
+            # Elements straight from the TLE text in one batch; NaN rows are malformed
+            elements = parse_tle_batch([e.get('TLE_LINE2') or '' for e in catalog]).tolist()
+            
+            for tle_entry, (incl, raan, ecc, argp, ma, n) in zip(catalog, elements):
                 sat_data = {
                     'norad_id': int(tle_entry.get('NORAD_CAT_ID', 0)),
                     'object_name': tle_entry.get('OBJECT_NAME', 'UNKNOWN'),
@@ -113,17 +117,29 @@ class AutoCatalogSync:
                     'tle_line1': tle_entry.get('TLE_LINE1'),
                     'tle_line2': tle_entry.get('TLE_LINE2'),
                     'epoch': tle_entry.get('EPOCH'),
-                    'mean_motion': float(tle_entry.get('MEAN_MOTION', 0)),
-                    'eccentricity': float(tle_entry.get('ECCENTRICITY', 0)),
-                    'inclination': float(tle_entry.get('INCLINATION', 0)),
-                    'raan': float(tle_entry.get('RA_OF_ASC_NODE', 0)),
-                    'arg_perigee': float(tle_entry.get('ARG_OF_PERICENTER', 0)),
-                    'mean_anomaly': float(tle_entry.get('MEAN_ANOMALY', 0))
+                    'mean_motion': n,
+                    'eccentricity': ecc,
+                    'inclination': incl,
+                    'raan': raan,
+                    'arg_perigee': argp,
+                    'mean_anomaly': ma
                 }
+                if n != n:  # NaN: fall back to the API's element fields
+                    sat_data.update({
+                        'mean_motion': float(tle_entry.get('MEAN_MOTION', 0)),
+                        'eccentricity': float(tle_entry.get('ECCENTRICITY', 0)),
+                        'inclination': float(tle_entry.get('INCLINATION', 0)),
+                        'raan': float(tle_entry.get('RA_OF_ASC_NODE', 0)),
+                        'arg_perigee': float(tle_entry.get('ARG_OF_PERICENTER', 0)),
+                        'mean_anomaly': float(tle_entry.get('MEAN_ANOMALY', 0))
+                    })
                 satellites_to_insert.append(sat_data)
             
-            # Bulk insert
-            success_count, fail_count = self.db.bulk_insert(satellites_to_insert)
+            # Bulk insert (history row is written in the same transaction)
+            success_count, fail_count = self.db.bulk_insert(satellites_to_insert, log_as="full_sync")
+            
+            # Drop objects that have left the catalog (decayed / no longer tracked)
+            self.db.prune_stale()
             
             # Update sync status
             self.last_sync = datetime.utcnow()
@@ -133,9 +149,6 @@ class AutoCatalogSync:
             logger.info(f"   - Successful: {success_count}")
             logger.info(f"   - Failed: {fail_count}")
             
-            # Log to database
-            self.db.log_update("full_sync", success_count, "success")
-            
             # Invalidate cache (new data available)
             self.cache.invalidate_all()
             
@@ -4,8 +4,11 @@ Reduces Space-Track.org API calls by caching TLE data with 24-hour TTL
 """
 
 import redis
+import xxhash
 import json
-import hashlib
+import random
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 import logging
@@ -19,10 +22,25 @@ class TLECacheManager:
     
     Features:
     - Automatic cache key generation from NORAD IDs
-    - 24-hour TTL (configurable)
-    - JSON serialization
+    - 24-hour TTL (configurable) with ±10% per-entry jitter
+    - Single-flight refresh locks to avoid cache stampedes
+    - Per-satellite Redis hashes (tle:sat:<id>), JSON blob for other payloads
     - Cache hit/miss logging
+    
+    Note: TLE lines are 69 bytes, so keep the server's hash-max-listpack-value
+    (hash-max-ziplist-value on Redis < 7) at 70 or more for the compact encoding.
     """
+
+    LOCK_TIMEOUT_SECONDS = 30
+    
+    # Delete the lock only while it still holds the caller's token: it may have
+    # expired and been taken by another worker in the meantime
+    RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
     
     def __init__(self, redis_url='redis://localhost:6379/0', ttl_hours=24):
         """
@@ -51,11 +69,52 @@ class TLECacheManager:
             norad_ids: List of NORAD catalog IDs
             
         Returns:
-            MD5 hash-based cache key
+            xxh3 hash-based cache key
+        """
+        # Non-cryptographic hash fed with packed IDs: no joined string to build
+        h = xxhash.xxh3_64()
+        for norad_id in sorted(int(i) for i in norad_ids):
+            h.update(norad_id.to_bytes(4, 'little'))
+        return f"tle:{h.hexdigest()}"
+    
+    @staticmethod
+    def _is_per_satellite(norad_ids: List[int], tle_data: Dict) -> bool:
+        """True if tle_data maps every requested NORAD ID to a flat string record."""
+        return set(tle_data) == {str(norad_id) for norad_id in norad_ids} and all(
+            isinstance(record, dict)
+            and all(isinstance(value, str) for value in record.values())
+            for record in tle_data.values()
+        )
+    
+    def _get_satellite_records(self, norad_ids: List[int]) -> Optional[Dict]:
+        """Read per-satellite hashes; None unless every ID is cached."""
+        pipe = self.client.pipeline(transaction=False)
+        for norad_id in norad_ids:
+            pipe.hgetall(f"tle:sat:{norad_id}")
+        records = pipe.execute()
+        
+        if not records or not all(records):
+            return None
+        
+        oldest = min(int(record.pop('ts')) for record in records)
+        cache_age = timedelta(seconds=int(time.time()) - oldest)
+        logger.info(f"✅ Cache HIT: {len(norad_ids)} satellites (age: {cache_age})")
+        return {str(norad_id): record for norad_id, record in zip(norad_ids, records)}
+    
+    def _lock_key(self, norad_ids: List[int]) -> str:
+        """Key of the refresh lock guarding a query's cache entry."""
+        return self._generate_key(norad_ids).replace("tle:", "tle:lock:", 1)
+    
+    def _effective_ttl_ms(self) -> int:
+        """
+        TTL for a single entry in milliseconds, jittered by ±10%.
+        
+        Entries written together (e.g. at app boot) then expire at
+        different times instead of refilling against the API at once.
         """
-        sorted_ids = sorted(norad_ids)
-        hash_input = ','.join(map(str, sorted_ids))
-        return f"tle:{hashlib.md5(hash_input.encode()).hexdigest()}"
+        ttl_ms = int(self.ttl * 1000)
+        jitter = ttl_ms // 10
+        return max(1, ttl_ms + random.randint(-jitter, jitter))
     
     def get_tle_data(self, norad_ids: List[int]) -> Optional[Dict]:
         """
@@ -73,6 +132,10 @@ class TLECacheManager:
         key = self._generate_key(norad_ids)
         
         try:
+            records = self._get_satellite_records(norad_ids)
+            if records is not None:
+                return records
+            
             cached = self.client.get(key)
             
             if cached:
@@ -97,20 +160,108 @@ class TLECacheManager:
         """
         if not self.client:
             return
-            
-        key = self._generate_key(norad_ids)
-        cache_entry = {
-            'tle_data': tle_data,
-            'cached_at': datetime.utcnow().isoformat(),
-            'norad_ids': norad_ids
-        }
         
         try:
-            self.client.setex(key, self.ttl, json.dumps(cache_entry))
+            if self._is_per_satellite(norad_ids, tle_data):
+                # One small hash per satellite; IDs shared between queries
+                # are stored once and can be refreshed individually.
+                now = int(time.time())
+                pipe = self.client.pipeline(transaction=False)
+                for norad_id, record in tle_data.items():
+                    sat_key = f"tle:sat:{norad_id}"
+                    pipe.delete(sat_key)
+                    pipe.hset(sat_key, mapping={**record, 'ts': now})
+                    pipe.pexpire(sat_key, self._effective_ttl_ms())
+                pipe.execute()
+            else:
+                key = self._generate_key(norad_ids)
+                cache_entry = {
+                    'tle_data': tle_data,
+                    'cached_at': datetime.utcnow().isoformat(),
+                    'norad_ids': norad_ids
+                }
+                self.client.set(key, json.dumps(cache_entry), px=self._effective_ttl_ms())
             logger.info(f"💾 Cached {len(norad_ids)} satellites (TTL: {self.ttl/3600:.1f}h)")
         except Exception as e:
             logger.error(f"Cache write error: {e}")
     
+    def acquire_refresh_lock(self, norad_ids: List[int]) -> Optional[str]:
+        """
+        Try to become the single worker refilling a cache miss.
+        
+        Args:
+            norad_ids: List of NORAD catalog IDs
+            
+        Returns:
+            Lock token to pass to release_refresh_lock if the caller should
+            fetch from the API, None if another worker already holds the lock
+            (use wait_for_tle_data instead)
+        """
+        token = uuid.uuid4().hex
+        if not self.client:
+            return token
+            
+        lock_key = self._lock_key(norad_ids)
+        
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, px=self.LOCK_TIMEOUT_SECONDS * 1000)
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Cache lock error: {e}")
+            return token
+    
+    def release_refresh_lock(self, norad_ids: List[int], token: str):
+        """
+        Release a lock taken with acquire_refresh_lock, if the caller still owns it.
+        
+        Args:
+            norad_ids: List of NORAD catalog IDs
+            token: Token returned by acquire_refresh_lock
+        """
+        if not self.client:
+            return
+            
+        lock_key = self._lock_key(norad_ids)
+        
+        try:
+            self.client.eval(self.RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.error(f"Cache unlock error: {e}")
+    
+    def wait_for_tle_data(self, norad_ids: List[int], timeout: float = 10.0,
+                          poll_interval: float = 0.2) -> Optional[Dict]:
+        """
+        Poll the cache while another worker refreshes the same query.
+        
+        Args:
+            norad_ids: List of NORAD catalog IDs
+            timeout: Maximum time to wait in seconds
+            poll_interval: Delay between polls in seconds
+            
+        Returns:
+            Cached TLE data dict, or None if the lock was released without
+            data or the timeout expired
+        """
+        if not self.client:
+            return None
+            
+        lock_key = self._lock_key(norad_ids)
+        deadline = time.monotonic() + timeout
+        
+        while time.monotonic() < deadline:
+            data = self.get_tle_data(norad_ids)
+            if data is not None:
+                return data
+            try:
+                if not self.client.exists(lock_key):
+                    return None
+            except Exception as e:
+                logger.error(f"Cache lock error: {e}")
+                return None
+            time.sleep(poll_interval)
+        
+        return None
+    
     def invalidate_all(self):
         """
         Clear all TLE cache entries.
@@ -1,10 +1,45 @@
 
 import os
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from orbit_engine import KeplerianEngine, J2Propagator, RiskAnalyzer, ScientificSatellite
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Risk categories indexed by the int8 codes returned from _classify
+RISK_THRESHOLDS_KM = np.array([0.5, 1.0, 2.5])
+RISK_LABELS = np.array(["CRITICAL", "HIGH", "MEDIUM", "LOW"])
+RISK_COLORS = np.array(["#FF0000", "#FF4B4B", "#FFA500", "#FFFF00"])
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _risk_codes(dists, thresholds):
+        """Counts the ascending thresholds each distance is not below."""
+        out = np.empty(dists.size, np.int8)
+        for i in numba.prange(dists.size):
+            code = 0
+            for thr in thresholds:
+                # not (d < thr) so NaN lands in the last bucket, like searchsorted
+                if not dists[i] < thr:
+                    code += 1
+            out[i] = code
+        return out
+
+    def _classify(dists):
+        """Maps distances (km) to risk codes 0=CRITICAL .. 3=LOW."""
+        return _risk_codes(dists, RISK_THRESHOLDS_KM)
+else:
+    def _classify(dists):
+        """Maps distances (km) to risk codes 0=CRITICAL .. 3=LOW."""
+        return np.searchsorted(RISK_THRESHOLDS_KM, dists, side='right').astype(np.int8)
+
+
 class CollisionWatchEngine:
     def __init__(self, threshold_km=5, forecast_days=7):
         self.threshold = threshold_km
@@ -15,14 +50,8 @@ class CollisionWatchEngine:
         
     def get_risk_level(self, distance_km):
         """Returns risk level and associated color."""
-        if distance_km < 0.5:
-            return "CRITICAL", "#FF0000" # Red
-        elif distance_km < 1.0:
-            return "HIGH", "#FF4B4B"    # Orange-Red
-        elif distance_km < 2.5:
-            return "MEDIUM", "#FFA500"  # Orange
-        else:
-            return "LOW", "#FFFF00"     # Yellow
+        code = _classify(np.array([distance_km], dtype=np.float64))[0]
+        return str(RISK_LABELS[code]), str(RISK_COLORS[code])
 
     def predict_collisions(self, satellites):
         """Forecasts potential collisions within the forecast window."""
@@ -39,16 +68,22 @@ class CollisionWatchEngine:
         ts = load.timescale()
         now = ts.now()
         
-        for s in sci_sats:
-            s.calculate_elements(now)
+        self.engine.prepare(sci_sats, now)
             
         # Run timeline analysis
         # We'll use 12-hour steps for a 7-day forecast
         events = self.analyzer.calculate_risk_timeline(sci_sats, duration_days=self.forecast_days, step_hours=12)
         
+        if not events:
+            return []
+
+        dists = np.fromiter((e['distance_km'] for e in events), dtype=np.float64, count=len(events))
+        codes = _classify(dists)
+        levels = RISK_LABELS.take(codes).tolist()
+        colors = RISK_COLORS.take(codes).tolist()
+
         processed_events = []
-        for e in events:
-            level, color = self.get_risk_level(e['distance_km'])
+        for e, level, color in zip(events, levels, colors):
             processed_events.append({
                 'Day': round(e['day'], 1),
                 'Satellite 1': e['sat1'],
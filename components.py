@@ -3,42 +3,132 @@ OrbitGuard AI - Reusable UI Components
 Modern, styled components for the Streamlit interface
 """
 
+import bisect
 import streamlit as st
 from typing import List, Dict, Optional
 import pandas as pd
 
 
+# Conjunction severity by miss distance (km): < 1 critical, < 5 warning, else nominal.
+# Rows are (status-dot class, label, border CSS var, label CSS var).
+_SEV_THRESH = (1.0, 5.0)
+_SEV_TABLE = (
+    ("critical", "CRITICAL", "critical", "danger"),
+    ("warning", "WARNING", "warning", "warning"),
+    ("online", "NOMINAL", "success", "success"),
+)
+_PROB_TPL = "<div style='margin-top: 0.5rem;'>Probability: <strong>{:.2%}</strong></div>"
+
+# Theme selector labels -> themes.py keys; dict order is the selectbox order
+_THEMES_MAP = {
+    "Elegant (DIREM)": "elegant",
+    "Light Mode": "light",
+    "Dark Mode": "dark",
+    "Gruvbox": "nadir",
+    "Dracula": "dracula",
+    "Solarized Dark": "solarized_dark",
+    "Solarized Light": "solarized_light",
+    "Custom Theme": "custom"
+}
+_THEME_LABELS = tuple(_THEMES_MAP)
+
+_STATUS_CLASSES = {
+    "online": "online",
+    "warning": "warning",
+    "critical": "critical"
+}
+
+_SAT_CARD_TPL = """
+    <div class="sat-card">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <span class="status-dot {status_class}"></span>
+                <span class="sat-name">{sat_name}</span>
+            </div>
+            <span class="sat-id">#{norad_id}</span>
+        </div>
+        <div style="display: flex; gap: 1.5rem; margin-top: 0.75rem; font-size: 0.85rem;">
+            <div>
+                <span style="opacity: 0.6;">LAT</span>
+                <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
+                    {lat:.2f}°
+                </span>
+            </div>
+            <div>
+                <span style="opacity: 0.6;">LON</span>
+                <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
+                    {lon:.2f}°
+                </span>
+            </div>
+            <div>
+                <span style="opacity: 0.6;">ALT</span>
+                <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
+                    {alt:.0f} km
+                </span>
+            </div>
+        </div>
+    </div>
+"""
+
+# Static HTML blobs, built once at import instead of on every rerun
+_HEADER_HTML = """
+    <div style="text-align: center; padding: 1rem 0 2rem 0;">
+        <h1 style="font-size: 3rem; margin-bottom: 0.5rem;">🛰️ OrbitGuard AI</h1>
+        <p style="font-size: 1.1rem; opacity: 0.8;">
+            Scientific LEO Risk Analysis & Satellite Monitoring Platform
+        </p>
+    </div>
+"""
+
+_LOADING_HTML = """
+    <div style="display: flex; justify-content: center; align-items: center; 
+                height: 200px; flex-direction: column; gap: 1rem;">
+        <div style="width: 60px; height: 60px; border: 3px solid var(--border); 
+                    border-top-color: var(--accent-primary); border-radius: 50%; 
+                    animation: spin 1s linear infinite;"></div>
+        <div style="opacity: 0.7;">Loading satellite data...</div>
+    </div>
+    <style>
+        @keyframes spin {
+            to { transform: rotate(360deg); }
+        }
+    </style>
+"""
+
+
 def render_header():
     """Render the main application header"""
-    st.markdown("""
-        <div style="text-align: center; padding: 1rem 0 2rem 0;">
-            <h1 style="font-size: 3rem; margin-bottom: 0.5rem;">🛰️ OrbitGuard AI</h1>
-            <p style="font-size: 1.1rem; opacity: 0.8;">
-                Scientific LEO Risk Analysis & Satellite Monitoring Platform
-            </p>
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False)
+def _stat_cell_html(label: str, value: str) -> str:
+    """Build the HTML for one stats bar cell"""
+    return f"""
+        <div class="glass-card" style="text-align: center; padding: 1.5rem; display: flex; flex-direction: column; justify-content: center; align-items: center; min-height: 120px;">
+            <div style="font-size: 2rem; font-weight: 800; 
+                 background: var(--accent-gradient); 
+                 -webkit-background-clip: text; 
+                 -webkit-text-fill-color: transparent;
+                 line-height: 1.2;">
+                {value}
+            </div>
+            <div style="font-size: 0.9rem; opacity: 0.8; margin-top: 0.5rem; font-weight: 500; text-transform: uppercase; letter-spacing: 1px;">
+                {label}
+            </div>
         </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 def render_stats_bar(stats: Dict):
-    """Render horizontal stats bar"""
-    cols = st.columns(len(stats))
-    for i, (label, value) in enumerate(stats.items()):
-        with cols[i]:
-            st.markdown(f"""
-                <div class="glass-card" style="text-align: center; padding: 1.5rem; display: flex; flex-direction: column; justify-content: center; align-items: center; min-height: 120px;">
-                    <div style="font-size: 2rem; font-weight: 800; 
-                         background: var(--accent-gradient); 
-                         -webkit-background-clip: text; 
-                         -webkit-text-fill-color: transparent;
-                         line-height: 1.2;">
-                        {value}
-                    </div>
-                    <div style="font-size: 0.9rem; opacity: 0.8; margin-top: 0.5rem; font-weight: 500; text-transform: uppercase; letter-spacing: 1px;">
-                        {label}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+    """Render horizontal stats bar as a single CSS grid element"""
+    # Cells are stripped so no blank line ends the markdown HTML block early
+    cells = "".join(_stat_cell_html(str(label), str(value)).strip() for label, value in stats.items())
+    st.markdown(
+        f'<div style="display: grid; grid-template-columns: repeat({len(stats)}, 1fr); gap: 1rem;">'
+        f'{cells}</div>',
+        unsafe_allow_html=True
+    )
 
 
 def render_view_toggle(current_view: str = "3D") -> str:
@@ -93,60 +183,28 @@ def render_view_toggle(current_view: str = "3D") -> str:
 def render_satellite_card(sat_name: str, norad_id: str, status: str = "online", 
                           lat: float = 0, lon: float = 0, alt: float = 0):
     """Render a satellite information card"""
-    status_class = {
-        "online": "online",
-        "warning": "warning", 
-        "critical": "critical"
-    }.get(status, "online")
+    status_class = _STATUS_CLASSES.get(status, "online")
     
-    st.markdown(f"""
-        <div class="sat-card">
-            <div style="display: flex; justify-content: space-between; align-items: center;">
-                <div>
-                    <span class="status-dot {status_class}"></span>
-                    <span class="sat-name">{sat_name}</span>
-                </div>
-                <span class="sat-id">#{norad_id}</span>
-            </div>
-            <div style="display: flex; gap: 1.5rem; margin-top: 0.75rem; font-size: 0.85rem;">
-                <div>
-                    <span style="opacity: 0.6;">LAT</span>
-                    <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
-                        {lat:.2f}°
-                    </span>
-                </div>
-                <div>
-                    <span style="opacity: 0.6;">LON</span>
-                    <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
-                        {lon:.2f}°
-                    </span>
-                </div>
-                <div>
-                    <span style="opacity: 0.6;">ALT</span>
-                    <span style="margin-left: 0.5rem; font-family: 'JetBrains Mono', monospace;">
-                        {alt:.0f} km
-                    </span>
-                </div>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SAT_CARD_TPL.format(
+        sat_name=sat_name, norad_id=norad_id, status_class=status_class,
+        lat=lat, lon=lon, alt=alt
+    ), unsafe_allow_html=True)
 
 
 def render_conjunction_alert(sat1: str, sat2: str, distance_km: float, 
                              time_utc: str, probability: float = None):
     """Render a conjunction alert card"""
-    severity = "critical" if distance_km < 1 else "warning" if distance_km < 5 else "online"
-    severity_label = "CRITICAL" if distance_km < 1 else "WARNING" if distance_km < 5 else "NOMINAL"
+    severity, severity_label, border_var, color_var = _SEV_TABLE[bisect.bisect_right(_SEV_THRESH, distance_km)]
     
-    prob_text = f"<div style='margin-top: 0.5rem;'>Probability: <strong>{probability:.2%}</strong></div>" if probability else ""
+    prob_text = _PROB_TPL.format(probability) if probability else ""
     
     st.markdown(f"""
-        <div class="sat-card" style="border-left: 3px solid var(--{severity.replace('online', 'success')});">
+        <div class="sat-card" style="border-left: 3px solid var(--{border_var});">
             <div style="display: flex; justify-content: space-between; align-items: flex-start;">
                 <div>
                     <span class="status-dot {severity}"></span>
                     <span style="font-weight: 600; text-transform: uppercase; font-size: 0.75rem; 
-                          color: var(--{'danger' if severity == 'critical' else 'warning' if severity == 'warning' else 'success'});">
+                          color: var(--{color_var});">
                         {severity_label}
                     </span>
                 </div>
@@ -178,25 +236,14 @@ def render_theme_selector():
     """Render advanced theme selector in sidebar"""
     st.markdown("### 🎨 Theme Settings")
     
-    themes_map = {
-        "Elegant (DIREM)": "elegant",
-        "Light Mode": "light",
-        "Dark Mode": "dark",
-        "Gruvbox": "nadir",
-        "Dracula": "dracula",
-        "Solarized Dark": "solarized_dark",
-        "Solarized Light": "solarized_light",
-        "Custom Theme": "custom"
-    }
-    
     selected_label = st.selectbox(
         "Select Visual Theme",
-        options=list(themes_map.keys()),
+        options=_THEME_LABELS,
         index=0,
         key="theme_selector"
     )
     
-    theme_key = themes_map[selected_label]
+    theme_key = _THEMES_MAP[selected_label]
     custom_theme = None
     
     if theme_key == "custom":
@@ -239,30 +286,23 @@ def render_theme_toggle():
 
 def render_loading_animation():
     """Render a custom loading animation"""
-    st.markdown("""
-        <div style="display: flex; justify-content: center; align-items: center; 
-                    height: 200px; flex-direction: column; gap: 1rem;">
-            <div style="width: 60px; height: 60px; border: 3px solid var(--border); 
-                        border-top-color: var(--accent-primary); border-radius: 50%; 
-                        animation: spin 1s linear infinite;"></div>
-            <div style="opacity: 0.7;">Loading satellite data...</div>
-        </div>
-        <style>
-            @keyframes spin {
-                to { transform: rotate(360deg); }
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_LOADING_HTML, unsafe_allow_html=True)
 
 
-def render_empty_state(message: str = "No data to display", icon: str = "🛰️"):
-    """Render an empty state placeholder"""
-    st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def _empty_state_html(message: str, icon: str) -> str:
+    """Build the HTML for an empty state placeholder"""
+    return f"""
         <div class="glass-card" style="text-align: center; padding: 3rem;">
             <div style="font-size: 4rem; margin-bottom: 1rem; opacity: 0.5;">{icon}</div>
             <div style="font-size: 1.1rem; opacity: 0.7;">{message}</div>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_empty_state(message: str = "No data to display", icon: str = "🛰️"):
+    """Render an empty state placeholder"""
+    st.markdown(_empty_state_html(message, icon), unsafe_allow_html=True)
 
 
 def render_risk_meter(score: float, max_score: float = 10.0, label: str = "Risk Level"):
@@ -287,16 +327,40 @@ def render_risk_meter(score: float, max_score: float = 10.0, label: str = "Risk
 
 
 
-def render_data_table(df: pd.DataFrame, title: str = None):
-    """Render a styled data table"""
+def render_data_table(df: pd.DataFrame, title: str = None, limit: int = 500):
+    """Render a styled data table, shipping at most `limit` rows to the browser"""
     if title:
         st.markdown(f"<h4>{title}</h4>", unsafe_allow_html=True)
     
+    view = df.head(limit) if len(df) > limit else df
+    
     st.dataframe(
-        df,
+        view,
         width=None,
         hide_index=True,
     )
+    
+    if view is not df:
+        st.caption(f"Showing {len(view):,} of {len(df):,} rows")
+        slug = (title or "data").lower().replace(' ', '_')
+        st.download_button(
+            label="📥 Download all rows",
+            data=_df_to_csv(df),
+            file_name=f"{slug}.csv",
+            mime="text/csv",
+            key=f"dl_table_{slug}"
+        )
+
+
+def _frame_fingerprint(df: pd.DataFrame):
+    """Cheap content hash so unchanged frames reuse their cached CSV"""
+    return (len(df), tuple(df.columns), int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _df_to_csv(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV bytes for st.download_button"""
+    return df.to_csv(index=False).encode()
 
 
 def render_download_buttons(data_dict: Dict[str, pd.DataFrame]):
@@ -305,7 +369,7 @@ def render_download_buttons(data_dict: Dict[str, pd.DataFrame]):
     
     for i, (name, df) in enumerate(data_dict.items()):
         with cols[i]:
-            csv = df.to_csv(index=False)
+            csv = _df_to_csv(df)
             st.download_button(
                 label=f"📥 {name}",
                 data=csv,
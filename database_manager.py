@@ -5,13 +5,76 @@ Handles SQLite database for TLE catalog storage and queries
 
 import sqlite3
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+import threading
+import weakref
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from pathlib import Path
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+_INSERT_SAT_SQL = '''
+    INSERT OR REPLACE INTO satellites (
+        norad_id, object_name, intl_designator, country, object_type,
+        tle_line1, tle_line2, epoch, mean_motion, eccentricity,
+        inclination, raan, arg_perigee, mean_anomaly, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+'''
+
+# Satellite dict fields in _INSERT_SAT_SQL column order. updated_at is not
+# bound: the statement stamps it in SQL, so tables created with the older
+# CURRENT_TIMESTAMP column default still get ISO 'T...Z' values.
+_SAT_FIELDS = (
+    'norad_id', 'object_name', 'intl_designator', 'country', 'object_type',
+    'tle_line1', 'tle_line2', 'epoch', 'mean_motion', 'eccentricity',
+    'inclination', 'raan', 'arg_perigee', 'mean_anomaly'
+)
+_SAT_DEFAULTS = dict.fromkeys(_SAT_FIELDS)
+_SAT_DEFAULTS['object_name'] = 'UNKNOWN'
+_get_sat_fields = itemgetter(*_SAT_FIELDS)
+
+# Every column of the satellites table, used to validate projections
+SATELLITE_COLUMNS = _SAT_FIELDS + (
+    'launch_date', 'is_active', 'created_at', 'updated_at', 'orbit_class'
+)
+
+# Default search_satellites projection: what a list view needs, no TLE text
+SEARCH_COLUMNS = (
+    'norad_id', 'object_name', 'country', 'object_type', 'mean_motion',
+    'eccentricity', 'inclination', 'epoch', 'is_active', 'orbit_class'
+)
+
+# Orbit regime derived from the elements (mean motion in rev/day)
+_ORBIT_CLASS_SQL = '''
+    orbit_class TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN eccentricity > 0.5 THEN 'HEO'
+            WHEN mean_motion > 11.25 THEN 'LEO'
+            WHEN mean_motion BETWEEN 0.99 AND 1.01 AND eccentricity < 0.01 THEN 'GEO'
+            WHEN mean_motion > 1.01 AND mean_motion <= 11.25 THEN 'MEO'
+        END
+    ) VIRTUAL
+'''
+
+
+class _ThreadConnection:
+    """Holds one thread's read connection in its thread-local storage."""
+    
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_thread_connection(connections, lock, conn):
+    """Finalizer: the owning thread is gone, so close and forget its connection."""
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
 
 class DatabaseManager:
     """
@@ -32,15 +95,96 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self.conn = None
+        self._in_memory = db_path == ':memory:'
+        self._local = threading.local()
+        # Open connections; read connections leave it when their thread exits
+        self._connections: Set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.RLock()  # guards _write_conn
+        self._write_conn = self._connect()
+        self._write_version = 0  # bumped by every write through this manager
+        self._stats_cache: Optional[Tuple[Tuple[int, int], Dict]] = None
+        self._fts_enabled = False
         self._initialize_db()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Read connection owned by the calling thread, opened on first use.
+        
+        Each thread reads through its own read-only connection so WAL
+        readers (Streamlit reruns) never queue behind a catalog sync. All
+        writes go through the single _write_conn under _write_lock. An
+        in-memory database only exists inside the connection that created
+        it, so there every thread uses the write connection.
+        
+        Streamlit runs each script in a short-lived thread, so a read
+        connection is closed as soon as its thread's locals are freed
+        rather than piling up until close().
+        """
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            if self._in_memory:
+                holder = _ThreadConnection(self._write_conn)
+            else:
+                conn = self._connect(readonly=True)
+                holder = _ThreadConnection(conn)
+                weakref.finalize(holder, _close_thread_connection,
+                                 self._connections, self._connections_lock, conn)
+            self._local.holder = holder
+        return holder.conn
+    
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """
+        Open and tune a new connection.
+        
+        check_same_thread stays off only so close() can close them all.
+        """
+        # Autocommit mode: single statements commit on their own and
+        # bulk_insert opens explicit transactions. The larger statement
+        # cache keeps the insert/search SQL prepared across calls.
+        # timeout doubles as the busy_timeout for lock waits under WAL
+        if readonly:
+            target, uri = Path(self.db_path).resolve().as_uri() + '?mode=ro', True
+        else:
+            target, uri = self.db_path, False
+        conn = sqlite3.connect(
+            target,
+            uri=uri,
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=512,
+            isolation_level=None
+        )
+        
+        # Connection tuning, applied once per connection:
+        # - WAL lets search/stats reads proceed while a TLE sync is writing
+        # - synchronous=NORMAL skips the per-commit fsync of the WAL; a power
+        #   loss may drop the last transaction, which is acceptable for TLE
+        #   data that the next sync replaces anyway
+        # - 64 MiB page cache, 256 MiB mmap, in-memory temp tables for sorts
+        # WAL and mmap only apply to file-backed databases; the journal mode
+        # is persistent, so read-only connections inherit it.
+        if not self._in_memory and not readonly:
+            conn.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+            ''')
+        if not self._in_memory:
+            conn.execute('PRAGMA mmap_size=268435456')
+        conn.executescript('''
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA recursive_triggers=ON;
+        ''')
+        
+        with self._connections_lock:
+            self._connections.add(conn)
+        return conn
+    
     def _initialize_db(self):
         """Create database and tables if they don't exist."""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        
-        cursor = self.conn.cursor()
+        cursor = self._write_conn.cursor()
         
         # Create satellites table
         cursor.execute('''
@@ -62,10 +206,27 @@ class DatabaseManager:
                 mean_anomaly REAL,
                 is_active INTEGER DEFAULT 1,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                ''' + _ORBIT_CLASS_SQL + '''
             )
         ''')
         
+        # Databases created before orbit_class existed get it added in place
+        cursor.execute('PRAGMA table_xinfo(satellites)')
+        if 'orbit_class' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE satellites ADD COLUMN' + _ORBIT_CLASS_SQL)
+        
+        # Databases created before updated_at switched to ISO 'T...Z' hold
+        # CURRENT_TIMESTAMP values ('YYYY-MM-DD HH:MM:SS'); a space sorts before
+        # 'T', which breaks prune_stale and MAX(updated_at). Rewrite them once.
+        if cursor.execute('PRAGMA user_version').fetchone()[0] < 1:
+            cursor.execute('''
+                UPDATE satellites
+                SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', updated_at)
+                WHERE updated_at NOT LIKE '%Z'
+            ''')
+            cursor.execute('PRAGMA user_version = 1')
+        
         # Create indexes for fast querying
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_object_name 
@@ -82,6 +243,35 @@ class DatabaseManager:
             ON satellites(object_type)
         ''')
         
+        # Ordered indexes for search_satellites: walk object_name order within
+        # the active/country filter and stop at LIMIT instead of sorting
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_active_name 
+            ON satellites(is_active, object_name) WHERE is_active = 1
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_country_name 
+            ON satellites(country, object_name)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_country_type_name 
+            ON satellites(country, object_type, object_name)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_updated_at 
+            ON satellites(updated_at)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_orbit_class 
+            ON satellites(orbit_class, object_name)
+        ''')
+        
+        self._initialize_fts(cursor)
+        
         # Create update history table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS update_history (
@@ -94,75 +284,214 @@ class DatabaseManager:
             )
         ''')
         
-        self.conn.commit()
+        self._write_conn.commit()
+        
+        # Refresh planner statistics; analysis_limit keeps this cheap on large catalogs
+        self._write_conn.executescript('PRAGMA analysis_limit=1000; ANALYZE;')
         logger.info(f"✅ Database initialized: {self.db_path}")
     
-    def insert_satellite(self, satellite_data: Dict) -> bool:
+    def _initialize_fts(self, cursor):
+        """
+        Create the FTS5 name index and the triggers that keep it in sync.
+        
+        satellites_fts is an external-content table over satellites, so it
+        only stores the inverted index. The trigram tokenizer gives the same
+        case-insensitive substring matches as LIKE '%q%'. INSERT OR REPLACE
+        deletes the old row before inserting, which only fires the delete
+        trigger because recursive_triggers is enabled on the connection.
+        """
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'satellites_fts'"
+        )
+        row = cursor.fetchone()
+        fts_exists = row is not None
+        
+        try:
+            if fts_exists and 'trigram' not in row[0]:
+                # Index from an older schema (word tokenizer): recreate it
+                cursor.execute('DROP TABLE satellites_fts')
+                fts_exists = False
+            
+            cursor.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS satellites_fts USING fts5(
+                    object_name, intl_designator,
+                    content='satellites', content_rowid='norad_id',
+                    tokenize='trigram'
+                );
+                
+                CREATE TRIGGER IF NOT EXISTS satellites_ai AFTER INSERT ON satellites BEGIN
+                    INSERT INTO satellites_fts(rowid, object_name, intl_designator)
+                    VALUES (new.norad_id, new.object_name, new.intl_designator);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS satellites_ad AFTER DELETE ON satellites BEGIN
+                    INSERT INTO satellites_fts(satellites_fts, rowid, object_name, intl_designator)
+                    VALUES ('delete', old.norad_id, old.object_name, old.intl_designator);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS satellites_au AFTER UPDATE ON satellites BEGIN
+                    INSERT INTO satellites_fts(satellites_fts, rowid, object_name, intl_designator)
+                    VALUES ('delete', old.norad_id, old.object_name, old.intl_designator);
+                    INSERT INTO satellites_fts(rowid, object_name, intl_designator)
+                    VALUES (new.norad_id, new.object_name, new.intl_designator);
+                END;
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"⚠️ FTS5 unavailable, name search falls back to LIKE: {e}")
+            return
+        
+        if not fts_exists:
+            # Index rows written before the FTS table existed
+            cursor.execute("INSERT INTO satellites_fts(satellites_fts) VALUES ('rebuild')")
+        
+        self._fts_enabled = True
+    
+    @staticmethod
+    def _rows_to_dicts(cursor: sqlite3.Cursor, rows: List[Tuple]) -> List[Dict]:
+        """Map plain tuple rows to dicts, reading column names once per result."""
+        cols = [c[0] for c in cursor.description]
+        return [dict(zip(cols, row)) for row in rows]
+    
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote a user search term as one FTS5 phrase."""
+        return '"' + query.replace('"', '""') + '"'
+    
+    @staticmethod
+    def _satellite_row(satellite_data: Dict) -> Tuple:
+        """Build the _INSERT_SAT_SQL parameter tuple for one satellite."""
+        return _get_sat_fields({**_SAT_DEFAULTS, **satellite_data})
+    
+    def insert_satellite(self, satellite_data: Dict, _commit: bool = True) -> bool:
         """
         Insert or update satellite TLE data.
         
         Args:
             satellite_data: Dictionary with satellite information
+            _commit: Commit immediately (False when called inside bulk_insert)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            cursor = self.conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO satellites (
-                    norad_id, object_name, intl_designator, country, object_type,
-                    tle_line1, tle_line2, epoch, mean_motion, eccentricity,
-                    inclination, raan, arg_perigee, mean_anomaly, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                satellite_data.get('norad_id'),
-                satellite_data.get('object_name', 'UNKNOWN'),
-                satellite_data.get('intl_designator'),
-                satellite_data.get('country'),
-                satellite_data.get('object_type'),
-                satellite_data.get('tle_line1'),
-                satellite_data.get('tle_line2'),
-                satellite_data.get('epoch'),
-                satellite_data.get('mean_motion'),
-                satellite_data.get('eccentricity'),
-                satellite_data.get('inclination'),
-                satellite_data.get('raan'),
-                satellite_data.get('arg_perigee'),
-                satellite_data.get('mean_anomaly'),
-                datetime.utcnow().isoformat()
-            ))
-            
-            self.conn.commit()
+            with self._write_lock:
+                cursor = self._write_conn.cursor()
+                cursor.execute(_INSERT_SAT_SQL, self._satellite_row(satellite_data))
+                self._write_version += 1
+                
+                if _commit:
+                    self._write_conn.commit()
             return True
             
         except Exception as e:
-            logger.error(f"Insert error for NORAD {satellite_data.get('norad_id')}: {e}")
+            norad_id = satellite_data.get('norad_id') if isinstance(satellite_data, dict) else None
+            logger.error(f"Insert error for NORAD {norad_id}: {e}")
             return False
     
-    def bulk_insert(self, satellites: List[Dict]) -> Tuple[int, int]:
+    def bulk_insert(self, satellites: List[Dict], log_as: Optional[str] = None) -> Tuple[int, int]:
         """
-        Insert multiple satellites in batch.
+        Insert multiple satellites in a single transaction.
+        
+        All rows stream through one executemany() and one commit. If a row
+        violates a constraint or is malformed, the batch is rolled back and
+        retried row by row (still in one transaction) so the bad rows can be
+        skipped. Any other database error (e.g. the file is locked by another
+        writer) rolls the batch back and counts every row as failed; the
+        write connection is never left inside an open transaction.
         
         Args:
             satellites: List of satellite data dictionaries
+            log_as: If set, record a successful update_history entry of this
+                type inside the same transaction (no extra commit)
             
         Returns:
             Tuple of (successful_count, failed_count)
         """
-        success_count = 0
-        fail_count = 0
+        conn = self._write_conn
         
-        for sat in satellites:
-            if self.insert_satellite(sat):
-                success_count += 1
-            else:
-                fail_count += 1
+        with self._write_lock:
+            try:
+                try:
+                    conn.execute('BEGIN')
+                    # Rows are built lazily as SQLite consumes them
+                    conn.executemany(_INSERT_SAT_SQL, map(self._satellite_row, satellites))
+                    success_count, fail_count = len(satellites), 0
+                    
+                except (sqlite3.IntegrityError, sqlite3.InterfaceError,
+                        sqlite3.ProgrammingError, TypeError, ValueError) as e:
+                    conn.rollback()
+                    logger.warning(f"Bulk insert batch rejected ({e}), retrying row by row")
+                    
+                    success_count = 0
+                    fail_count = 0
+                    
+                    conn.execute('BEGIN')
+                    for sat in satellites:
+                        if self.insert_satellite(sat, _commit=False):
+                            success_count += 1
+                        else:
+                            fail_count += 1
+                
+                if log_as:
+                    self.log_update(log_as, success_count, "success", commit=False)
+                conn.commit()
+                
+            except sqlite3.Error as e:
+                logger.error(f"Bulk insert failed, batch rolled back: {e}")
+                success_count, fail_count = 0, len(satellites)
+                
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+            self._write_version += 1
+            
+            # Refresh planner stats for tables that changed enough to matter;
+            # the batch is already committed, so a failure here is not fatal
+            if success_count > 100:
+                try:
+                    conn.execute('PRAGMA optimize')
+                except sqlite3.Error:
+                    pass
         
         logger.info(f"Bulk insert: {success_count} success, {fail_count} failed")
         return success_count, fail_count
     
+    def prune_stale(self, days: int = 30, chunk_size: int = 5000) -> int:
+        """
+        Delete satellites not refreshed by a sync in the last `days` days.
+        
+        Rows are removed oldest-first in chunks of `chunk_size`, each its own
+        short transaction, so readers and other writers are never blocked
+        for the whole prune.
+        
+        Args:
+            days: Age threshold on updated_at
+            chunk_size: Rows deleted per transaction
+            
+        Returns:
+            Number of satellites deleted
+        """
+        total = 0
+        
+        while True:
+            with self._write_lock:
+                cursor = self._write_conn.execute('''
+                    DELETE FROM satellites WHERE rowid IN (
+                        SELECT rowid FROM satellites
+                        WHERE updated_at < strftime('%Y-%m-%dT%H:%M:%fZ', 'now', ?)
+                        ORDER BY updated_at
+                        LIMIT ?
+                    )
+                ''', (f'-{days} days', chunk_size))
+                self._write_version += 1
+            if cursor.rowcount <= 0:
+                break
+            total += cursor.rowcount
+        
+        if total:
+            logger.info(f"🧹 Pruned {total} satellites not updated in {days} days")
+        return total
+    
     def get_satellite(self, norad_id: int) -> Optional[Dict]:
         """
         Get satellite by NORAD ID.
@@ -178,9 +507,37 @@ class DatabaseManager:
         row = cursor.fetchone()
         
         if row:
-            return dict(row)
+            return self._rows_to_dicts(cursor, [row])[0]
         return None
     
+    def get_satellites(self, norad_ids: Sequence[int], chunk_size: int = 900) -> List[Dict]:
+        """
+        Get many satellites by NORAD ID in as few queries as possible.
+        
+        IDs are looked up with one IN (...) query per chunk, keeping each
+        statement under SQLite's default 999 bound-parameter limit.
+        
+        Args:
+            norad_ids: NORAD catalog IDs (list or integer array)
+            chunk_size: Maximum IDs bound per query
+            
+        Returns:
+            Satellite data dictionaries for the IDs that exist
+        """
+        ids = [int(i) for i in norad_ids]
+        cursor = self.conn.cursor()
+        results = []
+        
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            cursor.execute(
+                f"SELECT * FROM satellites WHERE norad_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            results.extend(self._rows_to_dicts(cursor, cursor.fetchall()))
+        
+        return results
+    
     def search_satellites(
         self,
         query: Optional[str] = None,
@@ -188,7 +545,9 @@ class DatabaseManager:
         object_type: Optional[str] = None,
         active_only: bool = True,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        columns: Optional[Sequence[str]] = SEARCH_COLUMNS,
+        orbit_class: Optional[str] = None
     ) -> List[Dict]:
         """
         Search satellites with filters.
@@ -200,83 +559,126 @@ class DatabaseManager:
             active_only: Only return active satellites
             limit: Maximum results
             offset: Pagination offset
+            columns: Columns to return (default SEARCH_COLUMNS, None for all)
+            orbit_class: Filter by orbit regime ('LEO', 'MEO', 'GEO', 'HEO')
             
         Returns:
             List of satellite dictionaries
         """
+        if columns is None:
+            columns = SATELLITE_COLUMNS
+        unknown = set(columns).difference(SATELLITE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown satellite columns: {sorted(unknown)}")
+        
         cursor = self.conn.cursor()
         
         # Build dynamic query
-        sql = 'SELECT * FROM satellites WHERE 1=1'
+        sql = 'SELECT ' + ', '.join(f'satellites.{c}' for c in columns) + ' FROM satellites'
+        where = ' WHERE 1=1'
+        order = 'object_name'
         params = []
         
         if query:
             # Check if query is numeric (NORAD ID)
             if query.isdigit():
-                sql += ' AND norad_id = ?'
+                where += ' AND norad_id = ?'
                 params.append(int(query))
+            elif self._fts_enabled and len(query) >= 3:
+                # Trigram match ranked by BM25; terms under 3 chars have no trigrams
+                sql += ' JOIN satellites_fts ON satellites_fts.rowid = satellites.norad_id'
+                where += ' AND satellites_fts MATCH ?'
+                order = 'bm25(satellites_fts), satellites.object_name'
+                params.append(self._fts_query(query))
             else:
-                sql += ' AND (object_name LIKE ? OR CAST(norad_id AS TEXT) LIKE ?)'
+                where += ' AND (satellites.object_name LIKE ? OR CAST(norad_id AS TEXT) LIKE ?)'
                 params.extend([f'%{query}%', f'%{query}%'])
         
         if country:
-            sql += ' AND country = ?'
+            where += ' AND country = ?'
             params.append(country)
         
         if object_type:
-            sql += ' AND object_type = ?'
+            where += ' AND object_type = ?'
             params.append(object_type)
         
+        if orbit_class:
+            where += ' AND orbit_class = ?'
+            params.append(orbit_class)
+        
         if active_only:
-            sql += ' AND is_active = 1'
+            where += ' AND is_active = 1'
         
-        sql += ' ORDER BY object_name LIMIT ? OFFSET ?'
+        sql += where + f' ORDER BY {order} LIMIT ? OFFSET ?'
         params.extend([limit, offset])
         
         cursor.execute(sql, params)
         rows = cursor.fetchall()
         
-        return [dict(row) for row in rows]
+        return self._rows_to_dicts(cursor, rows)
     
-    def get_all_norad_ids(self) -> List[int]:
-        """Get list of all NORAD IDs in database."""
+    def iter_norad_ids(self, batch_size: int = 1000) -> Iterator[int]:
+        """Yield all NORAD IDs in ascending order, fetched in batches."""
         cursor = self.conn.cursor()
+        cursor.arraysize = batch_size
         cursor.execute('SELECT norad_id FROM satellites ORDER BY norad_id')
-        return [row[0] for row in cursor.fetchall()]
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            for row in batch:
+                yield row[0]
+    
+    def get_all_norad_ids(self) -> np.ndarray:
+        """Get all NORAD IDs in database as a sorted int32 array."""
+        return np.fromiter(self.iter_norad_ids(), dtype=np.int32)
     
     def get_statistics(self) -> Dict:
         """
         Get database statistics.
         
+        Totals, last update and the top-10 countries come back from a single
+        statement; the country list is packed with json_group_array. The
+        result is cached until the table changes: _write_version covers
+        writes through this manager and PRAGMA data_version on the write
+        connection covers commits from other processes (the sync daemon).
+        
         Returns:
             Dictionary with statistics
         """
-        cursor = self.conn.cursor()
+        with self._write_lock:
+            external = self._write_conn.execute('PRAGMA data_version').fetchone()[0]
+            version = (self._write_version, external)
         
-        # Total satellites
-        cursor.execute('SELECT COUNT(*) FROM satellites')
-        total_sats = cursor.fetchone()[0]
+        cached = self._stats_cache
+        if cached is not None and cached[0] == version:
+            return self._copy_stats(cached[1])
         
-        # Active satellites
-        cursor.execute('SELECT COUNT(*) FROM satellites WHERE is_active = 1')
-        active_sats = cursor.fetchone()[0]
-        
-        # By country
+        cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT country, COUNT(*) as count 
-            FROM satellites 
-            WHERE country IS NOT NULL 
-            GROUP BY country 
-            ORDER BY count DESC 
-            LIMIT 10
+            WITH counts AS (
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(is_active = 1), 0) AS active,
+                       MAX(updated_at) AS last_update
+                FROM satellites
+            ),
+            top_countries AS (
+                SELECT country, COUNT(*) AS count 
+                FROM satellites 
+                WHERE country IS NOT NULL 
+                GROUP BY country 
+                ORDER BY count DESC 
+                LIMIT 10
+            )
+            SELECT counts.total, counts.active, counts.last_update,
+                   (SELECT json_group_array(json_object('country', country, 'count', count))
+                    FROM top_countries)
+            FROM counts
         ''')
-        top_countries = [dict(row) for row in cursor.fetchall()]
+        total_sats, active_sats, last_update, countries_json = cursor.fetchone()
+        top_countries = sorted(json.loads(countries_json), key=lambda c: -c['count'])
         
-        # Last update
-        cursor.execute('SELECT MAX(updated_at) FROM satellites')
-        last_update = cursor.fetchone()[0]
-        
-        return {
+        stats = {
             'total_satellites': total_sats,
             'active_satellites': active_sats,
             'inactive_satellites': total_sats - active_sats,
@@ -284,8 +686,16 @@ class DatabaseManager:
             'last_update': last_update,
             'database_path': self.db_path
         }
+        self._stats_cache = (version, stats)
+        return self._copy_stats(stats)
+    
+    @staticmethod
+    def _copy_stats(stats: Dict) -> Dict:
+        """Copy of a cached stats dict that callers can mutate freely."""
+        return {**stats, 'top_countries': [dict(c) for c in stats['top_countries']]}
     
-    def log_update(self, update_type: str, count: int, status: str, error: Optional[str] = None):
+    def log_update(self, update_type: str, count: int, status: str,
+                   error: Optional[str] = None, commit: bool = True):
         """
         Log catalog update to history.
         
@@ -294,13 +704,17 @@ class DatabaseManager:
             count: Number of satellites updated
             status: "success" or "failed"
             error: Error message if failed
+            commit: Commit immediately; pass False when writing inside an
+                open write transaction that the caller will commit
         """
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO update_history (update_type, satellites_updated, status, error_message)
-            VALUES (?, ?, ?, ?)
-        ''', (update_type, count, status, error))
-        self.conn.commit()
+        with self._write_lock:
+            cursor = self._write_conn.cursor()
+            cursor.execute('''
+                INSERT INTO update_history (update_type, satellites_updated, status, error_message)
+                VALUES (?, ?, ?, ?)
+            ''', (update_type, count, status, error))
+            if commit:
+                self._write_conn.commit()
     
     def get_update_history(self, limit: int = 10) -> List[Dict]:
         """Get recent update history."""
@@ -310,12 +724,22 @@ class DatabaseManager:
             ORDER BY timestamp DESC 
             LIMIT ?
         ''', (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+        return self._rows_to_dicts(cursor, cursor.fetchall())
     
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the connections opened by every thread."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        self._local = threading.local()
+        
+        for conn in connections:
+            try:
+                conn.execute('PRAGMA optimize')
+            except sqlite3.Error:
+                pass
+            conn.close()
+        if connections:
             logger.info("Database connection closed")
     
     def __enter__(self):
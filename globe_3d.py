@@ -3,6 +3,11 @@ OrbitGuard AI - 3D Globe Visualization Component
 Interactive 3D Earth with real-time satellite tracking using Three.js
 """
 
+import json
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
 THREE_JS_GLOBE_HTML = """
 <!DOCTYPE html>
 <html>
@@ -132,48 +137,38 @@ THREE_JS_GLOBE_HTML = """
         const stars = new THREE.Points(starsGeometry, starsMaterial);
         scene.add(stars);
 
-        // Satellites array
-        const satellites = [];
+        // Satellites: one instanced mesh per layer (marker + glow), so the
+        // whole catalog is two draw calls with shared geometry/material.
+        // Positions arrive precomputed from Python as a flat xyz array.
         const satelliteGroup = new THREE.Group();
         scene.add(satelliteGroup);
 
-        // Function to add satellites
-        function addSatellite(lat, lon, alt, name, isCritical = false) {
-            // Convert lat/lon/alt to 3D position
-            const radius = 1 + (alt / 6371); // Earth radius = 6371 km
-            const phi = (90 - lat) * (Math.PI / 180);
-            const theta = (lon + 180) * (Math.PI / 180);
-
-            const x = -(radius * Math.sin(phi) * Math.cos(theta));
-            const y = radius * Math.cos(phi);
-            const z = radius * Math.sin(phi) * Math.sin(theta);
-
-            // Satellite marker - monochrome (white/gray)
-            const satGeometry = new THREE.SphereGeometry(0.01, 8, 8);
-            const satMaterial = new THREE.MeshBasicMaterial({
-                color: isCritical ? 0x888888 : 0xffffff,  // Gray for critical, white for normal
-                emissive: isCritical ? 0x888888 : 0xffffff,
-                emissiveIntensity: 0.8
-            });
-            const satMesh = new THREE.Mesh(satGeometry, satMaterial);
-            satMesh.position.set(x, y, z);
-            satMesh.userData = { name, lat, lon, alt };
-
-            // Glow effect for satellite - monochrome
-            const glowSatGeometry = new THREE.SphereGeometry(0.015, 16, 16);
-            const glowSatMaterial = new THREE.MeshBasicMaterial({
-                color: isCritical ? 0x888888 : 0xffffff,
-                transparent: true,
-                opacity: 0.4
-            });
-            const glowSatMesh = new THREE.Mesh(glowSatGeometry, glowSatMaterial);
-            glowSatMesh.position.copy(satMesh.position);
-            
-            satelliteGroup.add(satMesh);
-            satelliteGroup.add(glowSatMesh);
+        // Satellite marker - monochrome (white/gray)
+        const satGeometry = new THREE.SphereGeometry(0.01, 8, 8);
+        const satMaterial = new THREE.MeshBasicMaterial({ color: 0xffffff });
 
-            satellites.push({ mesh: satMesh, glow: glowSatMesh, data: { name, lat, lon, alt } });
-        }
+        // Glow effect for satellite - monochrome
+        const glowSatGeometry = new THREE.SphereGeometry(0.015, 16, 16);
+        const glowSatMaterial = new THREE.MeshBasicMaterial({
+            color: 0xffffff,
+            transparent: true,
+            opacity: 0.4
+        });
+
+        // Pulse every glow through one uniform instead of rescaling each mesh per frame
+        const glowPulse = { value: 1.0 };
+        glowSatMaterial.onBeforeCompile = (shader) => {
+            shader.uniforms.pulse = glowPulse;
+            shader.vertexShader = 'uniform float pulse;\\n' + shader.vertexShader.replace(
+                '#include <begin_vertex>',
+                'vec3 transformed = vec3( position ) * pulse;'
+            );
+        };
+
+        const normalColor = new THREE.Color(0xffffff);
+        const criticalColor = new THREE.Color(0x888888);  // Gray for critical, white for normal
+        let satMesh = null;
+        let glowSatMesh = null;
 
         // Mouse interaction
         let isDragging = false;
@@ -219,10 +214,7 @@ THREE_JS_GLOBE_HTML = """
             }
 
             // Pulse satellites
-            satellites.forEach(sat => {
-                const scale = 1 + Math.sin(Date.now() * 0.003) * 0.2;
-                sat.glow.scale.set(scale, scale, scale);
-            });
+            glowPulse.value = 1 + Math.sin(Date.now() * 0.003) * 0.2;
 
             renderer.render(scene, camera);
         }
@@ -238,33 +230,76 @@ THREE_JS_GLOBE_HTML = """
         animate();
 
         // Expose function to Python
-        window.updateSatellites = function(satellitesData) {
+        // data: { positions: [x0, y0, z0, x1, ...], critical: [0/1, ...] }
+        window.updateSatellites = function(data) {
             // Clear existing satellites
-            satellites.forEach(sat => {
-                satelliteGroup.remove(sat.mesh);
-                satelliteGroup.remove(sat.glow);
+            [satMesh, glowSatMesh].forEach(mesh => {
+                if (mesh) {
+                    satelliteGroup.remove(mesh);
+                    if (mesh.dispose) mesh.dispose();
+                }
             });
-            satellites.length = 0;
 
-            // Add new satellites
-            satellitesData.forEach(sat => {
-                addSatellite(sat.lat, sat.lon, sat.alt, sat.name, sat.critical || false);
-            });
+            const positions = new Float32Array(data.positions);
+            const count = positions.length / 3;
+            satMesh = new THREE.InstancedMesh(satGeometry, satMaterial, count);
+            glowSatMesh = new THREE.InstancedMesh(glowSatGeometry, glowSatMaterial, count);
+
+            const matrix = new THREE.Matrix4();
+            for (let i = 0; i < count; i++) {
+                matrix.makeTranslation(positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]);
+                const color = data.critical[i] ? criticalColor : normalColor;
+                satMesh.setMatrixAt(i, matrix);
+                glowSatMesh.setMatrixAt(i, matrix);
+                satMesh.setColorAt(i, color);
+                glowSatMesh.setColorAt(i, color);
+            }
+
+            // Instances sit far from the shared geometry's bounding sphere
+            satMesh.frustumCulled = false;
+            glowSatMesh.frustumCulled = false;
+            satelliteGroup.add(satMesh);
+            satelliteGroup.add(glowSatMesh);
 
-            document.getElementById('sat-count').textContent = satellitesData.length;
+            document.getElementById('sat-count').textContent = count;
         };
 
         // Initial satellites (will be replaced by Python data)
-        window.updateSatellites([
-            { lat: 0, lon: 0, alt: 400, name: 'Test Sat 1', critical: false },
-            { lat: 45, lon: 90, alt: 550, name: 'Test Sat 2', critical: true }
-        ]);
+        window.updateSatellites({ positions: [], critical: [] });
     </script>
 </body>
 </html>
 """
 
 
+# Split once at import so each render is a single concatenation around the data
+_DATA_PLACEHOLDER = "// Initial satellites (will be replaced by Python data)\n        window.updateSatellites({ positions: [], critical: [] });"
+_GLOBE_HEAD, _, _GLOBE_TAIL = THREE_JS_GLOBE_HTML.partition(_DATA_PLACEHOLDER)
+
+
+def globe_positions(lat, lon, alt):
+    """
+    Convert geodetic coordinates to globe scene coordinates (Earth radius = 1).
+    
+    Args:
+        lat, lon: Arrays of latitude/longitude in degrees
+        alt: Array of altitudes in km
+    
+    Returns:
+        (N, 3) float32 array of x, y, z in the Three.js scene frame
+    """
+    r = 1 + np.asarray(alt, dtype=np.float64) / EARTH_RADIUS_KM
+    phi = np.radians(90 - np.asarray(lat, dtype=np.float64))
+    theta = np.radians(np.asarray(lon, dtype=np.float64) + 180)
+    sin_phi = np.sin(phi)
+    
+    return np.column_stack((
+        -r * sin_phi * np.cos(theta),
+        r * np.cos(phi),
+        r * sin_phi * np.sin(theta)
+    )).astype(np.float32)
+
+
 def create_3d_globe_html(satellites_data):
     """
     Create HTML for 3D globe with satellite data
@@ -275,21 +310,24 @@ def create_3d_globe_html(satellites_data):
     Returns:
         HTML string ready to embed in Streamlit
     """
-    import json
-    
     # Debug: print satellite count
     print(f"[DEBUG] Creating globe with {len(satellites_data)} satellites")
     
-    # Convert satellites to JSON
-    sats_json = json.dumps(satellites_data)
+    n = len(satellites_data)
+    xyz = globe_positions(
+        np.fromiter((s['lat'] for s in satellites_data), np.float64, n),
+        np.fromiter((s['lon'] for s in satellites_data), np.float64, n),
+        np.fromiter((s.get('alt', 0) for s in satellites_data), np.float64, n)
+    )
+    
+    # Flat xyz buffer, rounded to ~60 m on the globe to keep the JSON small
+    sats_json = json.dumps({
+        'positions': np.round(xyz.ravel().astype(np.float64), 5).tolist(),
+        'critical': [1 if s.get('critical') else 0 for s in satellites_data]
+    }, separators=(',', ':'))
     
     # Create complete HTML with data injected
-    html_with_data = THREE_JS_GLOBE_HTML.replace(
-        "// Initial satellites (will be replaced by Python data)\n        window.updateSatellites([",
-        f"// Initial satellites (from Python data)\n        console.log('Loading satellites:', {sats_json});\n        window.updateSatellites({sats_json}); /* old test data: ["
-    ).replace(
-        "        ]);\n    </script>",
-        "        ]); */\n    </script>"
+    return (
+        f"{_GLOBE_HEAD}// Initial satellites (from Python data)\n"
+        f"        window.updateSatellites({sats_json});{_GLOBE_TAIL}"
     )
-    
-    return html_with_data
@@ -1,17 +1,328 @@
 
 from skyfield.api import load, EarthSatellite, wgs84, utc
+from skyfield.nutationlib import iau2000b_radians
+from skyfield.positionlib import Geocentric
+from skyfield.sgp4lib import TEME
+from skyfield.units import Distance, Velocity
+from sgp4.api import SatrecArray, jday
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import folium
 import requests
-from itertools import combinations
+from requests.adapters import HTTPAdapter
 import os
+import csv
+import time
+import hashlib
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+SPACE_TRACK_LOGIN_URL = "https://www.space-track.org/ajaxauth/login"
+# Space-Track session cookies expire after roughly two hours; log in again well before that
+SESSION_TTL_S = 3600
+# Concurrent Space-Track queries per fetch (matches the session's connection pool)
+FETCH_WORKERS = 4
+
+# Safety margin applied to the Gram-matrix distance screen before exact refinement
+SCREEN_MARGIN = 1.05
+# Tile edge for the NumPy screen; bounds each Gram block to SCREEN_BLOCK² floats
+SCREEN_BLOCK = 1024
+
+CONJUNCTION_COLUMNS = ("time_utc", "satellite_1", "satellite_2", "distance_km")
+PASS_COLUMNS = ("Satellite", "UTC Time", "Event", "Azimuth (deg)", "Elevation (deg)")
+
+
+def _screen_close_pairs_numpy(pos, threshold_km):
+    """
+    Finds satellite pairs closer than threshold_km at a single instant.
+    Fallback for _screen_close_pairs when numba is not installed.
+
+    The N² screen uses |a - b|² = |a|² + |b|² - 2 a·b, so it is a BLAS
+    matrix product rather than an (N, N, 3) difference tensor. It is tiled
+    over the upper triangle in SCREEN_BLOCK-sized blocks so memory stays
+    bounded for full-catalog N. The identity loses a little precision to
+    cancellation, so surviving candidates are re-evaluated from their
+    direct difference; sqrt is only taken on the hits.
+
+    Args:
+        pos: (N, 3) float64 array of positions in km
+
+    Returns:
+        Tuple of (i, j, distance_km) arrays with i < j
+    """
+    n = len(pos)
+    sq = np.einsum('ij,ij->i', pos, pos)
+    screen2 = (threshold_km * SCREEN_MARGIN) ** 2
+    cand_i, cand_j = [np.empty(0, np.intp)], [np.empty(0, np.intp)]
+    for i0 in range(0, n, SCREEN_BLOCK):
+        rows = slice(i0, i0 + SCREEN_BLOCK)
+        for j0 in range(i0, n, SCREEN_BLOCK):
+            cols = slice(j0, j0 + SCREEN_BLOCK)
+            d2 = pos[rows] @ pos[cols].T
+            d2 *= -2.0
+            d2 += sq[rows, None]
+            d2 += sq[None, cols]
+            close = d2 < screen2
+            if j0 == i0:
+                close = np.triu(close, k=1)
+            bi, bj = np.nonzero(close)
+            cand_i.append(bi + i0)
+            cand_j.append(bj + j0)
+    i = np.concatenate(cand_i)
+    j = np.concatenate(cand_j)
+    order = np.lexsort((j, i))
+    i, j = i[order], j[order]
+
+    delta = pos[i] - pos[j]
+    d2 = np.einsum('ij,ij->i', delta, delta)
+    hits = d2 < threshold_km ** 2
+    return i[hits], j[hits], np.sqrt(d2[hits])
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: positions from failed propagations are NaN and must compare False
+    @numba.njit(cache=True, parallel=True)
+    def _screen_close_pairs(pos, threshold_km):
+        """
+        Finds satellite pairs closer than threshold_km at a single instant.
+
+        Two passes over the upper triangle: count hits per row, then fill the
+        preallocated outputs at each row's offset, so no locking is needed.
+        """
+        n = pos.shape[0]
+        thresh2 = threshold_km * threshold_km
+        counts = np.zeros(n + 1, np.int64)
+        for i in numba.prange(n):
+            c = 0
+            for j in range(i + 1, n):
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                dz = pos[i, 2] - pos[j, 2]
+                if dx * dx + dy * dy + dz * dz < thresh2:
+                    c += 1
+            counts[i + 1] = c
+        offsets = np.cumsum(counts)
+
+        out_i = np.empty(offsets[n], np.int64)
+        out_j = np.empty(offsets[n], np.int64)
+        out_d = np.empty(offsets[n], np.float64)
+        for i in numba.prange(n):
+            k = offsets[i]
+            for j in range(i + 1, n):
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                dz = pos[i, 2] - pos[j, 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 < thresh2:
+                    out_i[k] = i
+                    out_j[k] = j
+                    out_d[k] = np.sqrt(d2)
+                    k += 1
+        return out_i, out_j, out_d
+else:
+    _screen_close_pairs = _screen_close_pairs_numpy
+
+
+def _kdtree_close_pairs(pos, threshold_km):
+    """
+    Finds satellite pairs closer than threshold_km at a single instant.
+
+    A KD-tree only visits pairs in neighbouring cells, so the cost is
+    O(N log N) rather than N² when the threshold is tiny next to orbit radii.
+    NaN positions (failed propagations) are dropped before the tree is built.
+
+    Returns:
+        Tuple of (i, j, distance_km) arrays with i < j
+    """
+    valid = np.flatnonzero(np.isfinite(pos).all(axis=1))
+    pairs = cKDTree(pos[valid]).query_pairs(threshold_km, output_type='ndarray')
+    i, j = valid[pairs[:, 0]], valid[pairs[:, 1]]
+    order = np.lexsort((j, i))
+    i, j = i[order], j[order]
+
+    delta = pos[i] - pos[j]
+    d2 = np.einsum('ij,ij->i', delta, delta)
+    hits = d2 < threshold_km ** 2
+    return i[hits], j[hits], np.sqrt(d2[hits])
+
+
+def _cached_tle_rows(cached):
+    """
+    (name, line1, line2) tuples from a TLE cache lookup, or None on a miss.
+    
+    Records written by another producer in a different layout count as a
+    miss, so the caller falls back to a live fetch.
+    """
+    if not cached:
+        return None
+    try:
+        return [(r['OBJECT_NAME'], r['TLE_LINE1'], r['TLE_LINE2']) for r in cached.values()]
+    except (KeyError, TypeError):
+        return None
+
+
+def _response_json(response):
+    """Decodes a JSON response body, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _write_csv(path, header, rows):
+    """Streams report rows straight to disk without building a DataFrame."""
+    with open(path, "w", newline="") as f:
+        # LF on every platform (not the csv module's \r\n or os.linesep) so
+        # report files are byte-identical wherever they are generated
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+@lru_cache(maxsize=None)
+def _timescale():
+    """Process-wide skyfield timescale (building one parses the leap-second tables)."""
+    return load.timescale()
+
+
+# Logged-in Space-Track sessions shared by all agents: credential digest -> (session, expires_at)
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+# Serializes logins so concurrent callers wait for one login instead of racing
+_LOGIN_LOCK = threading.Lock()
+
+
+def _cached_session(key):
+    """Fresh cached session for a credential digest, or None."""
+    with _SESSIONS_LOCK:
+        cached = _SESSIONS.get(key)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+    return None
+
+
+def _session_key(username, password):
+    return hashlib.sha256(f"{username}\0{password}".encode()).hexdigest()
+
+
+def _space_track_session(username, password):
+    """
+    Returns a logged-in, connection-pooled Space-Track session.
+
+    Sessions are cached per credential pair (keyed on a digest, so a wrong
+    password never reuses someone else's login) until SESSION_TTL_S expires.
+
+    Returns:
+        requests.Session, or None if the login was rejected
+    """
+    key = _session_key(username, password)
+    session = _cached_session(key)
+    if session is not None:
+        return session
+
+    with _LOGIN_LOCK:
+        # Another thread may have logged in while this one waited
+        session = _cached_session(key)
+        if session is not None:
+            return session
+
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        login = session.post(SPACE_TRACK_LOGIN_URL, data={"identity": username, "password": password})
+        if login.status_code != 200:
+            return None
+
+        with _SESSIONS_LOCK:
+            _SESSIONS[key] = (session, time.monotonic() + SESSION_TTL_S)
+    return session
+
+
+def _space_track_get(username, password, session, urls):
+    """
+    GETs urls over a logged-in session, concurrently, in request order.
+
+    Space-Track can expire a session cookie before SESSION_TTL_S. If any
+    query comes back unauthorized, the cached session is dropped, the
+    credentials log in once more and just the rejected queries are retried.
+
+    Returns:
+        List of requests.Response, one per URL
+    """
+    def get_all(session, urls):
+        if len(urls) <= 1:
+            return [session.get(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            return list(pool.map(session.get, urls))
+
+    responses = get_all(session, urls)
+    rejected = [k for k, response in enumerate(responses) if response.status_code in (401, 403)]
+    if rejected:
+        key = _session_key(username, password)
+        with _SESSIONS_LOCK:
+            # Leave a session another thread already replaced alone
+            if _SESSIONS.get(key, (None,))[0] is session:
+                del _SESSIONS[key]
+        session = _space_track_session(username, password)
+        if session is not None:
+            for k, response in zip(rejected, get_all(session, [urls[k] for k in rejected])):
+                responses[k] = response
+    return responses
+
+
+def _propagate_teme(satellites, t):
+    """
+    Propagates every satellite to every instant in a single SatrecArray call.
+
+    Positions are TEME; they differ from skyfield's GCRS output only by a
+    rotation common to all satellites, so pairwise distances are unchanged.
+
+    Args:
+        satellites: List of skyfield EarthSatellite objects
+        t: Array-valued skyfield Time
+
+    Returns:
+        Tuple of (N, T, 3) float64 arrays of positions (km) and velocities
+        (km/s), NaN where SGP4 failed
+    """
+    if not satellites:
+        return np.empty((0, len(t), 3)), np.empty((0, len(t), 3))
+    jd, fr = (np.asarray(x, dtype=np.float64) for x in jday(*t.utc))
+    errors, r, v = SatrecArray([sat.model for sat in satellites]).sgp4(jd, fr)
+    failed = errors != 0
+    r[failed] = np.nan
+    v[failed] = np.nan
+    return r, v
+
 
 class OrbitGuardAI:
-    def __init__(self, threshold_km=10):
-        self.ts = load.timescale()
+    def __init__(self, threshold_km=10, cache=None):
+        """
+        Args:
+            threshold_km: Conjunction warning distance
+            cache: Optional TLECacheManager; ID lookups in fetch_tles are
+                served from it while fresh and written back after a fetch
+        """
+        self.ts = _timescale()
+        self.cache = cache
         self.now = datetime.now(utc)
         self.threshold_km = threshold_km
         self.tle_data = []
@@ -32,85 +343,107 @@ class OrbitGuardAI:
         if not username or not password:
             raise Exception("Space-Track credentials are required for live analysis.")
 
-        session = requests.Session()
-        login_url = "https://www.space-track.org/ajaxauth/login"
-        
-        # Authenticate
-        login = session.post(login_url, data={"identity": username, "password": password})
-        if login.status_code != 200:
-            raise Exception("Space-Track login failed. Please check your credentials.")
-
         # Split identifiers into IDs and Names
         ids = [str(x) for x in identifiers if str(x).isdigit()]
         names = [str(x) for x in identifiers if not str(x).isdigit()]
         
         self.tle_data = []
         
+        # Authenticate before serving anything, cached data included (reuses
+        # the pooled session when already logged in, so this is usually free)
+        session = _space_track_session(username, password)
+        if session is None:
+            raise Exception("Space-Track login failed. Please check your credentials.")
+        
+        # Serve ID lookups from the TLE cache when every requested ID is fresh
+        cached = self.cache.get_tle_data(ids) if self.cache is not None and ids else None
+        rows = _cached_tle_rows(cached)
+        if rows:
+            self.tle_data.extend(rows)
+            ids = []
+        
+        # On a miss only one worker refills the cache from Space-Track; the
+        # others wait for its result and only fetch themselves if none arrives
+        lock_ids, lock_token = ids, None
+        if ids and self.cache is not None:
+            lock_token = self.cache.acquire_refresh_lock(ids)
+            if lock_token is None:
+                rows = _cached_tle_rows(self.cache.wait_for_tle_data(ids))
+                if rows:
+                    self.tle_data.extend(rows)
+                    ids = []
+        
         try:
+            urls = []
+            
             # 1. Fetch by ID
             if ids:
                 # Use 'gp' class (replaces deprecated 'tle_latest')
-                url_ids = (
+                urls.append(
                     "https://www.space-track.org/basicspacedata/query/class/gp/"
                     f"NORAD_CAT_ID/{','.join(ids)}/format/json"
                 )
-                resp_ids = session.get(url_ids)
-                if resp_ids.status_code == 200:
-                    data = resp_ids.json()
-                    self.tle_data.extend([(entry['OBJECT_NAME'], entry['TLE_LINE1'], entry['TLE_LINE2']) for entry in data])
 
             # 2. Fetch by Name
-            if names:
-                for name in names:
-                    clean_name = name.strip()
-                    encoded_name = urllib.parse.quote(clean_name)
+            for name in names:
+                clean_name = name.strip()
+                encoded_name = urllib.parse.quote(clean_name)
+                
+                # Use 'gp' class and ~~ for case-insensitive LIKE search
+                urls.append(
+                    "https://www.space-track.org/basicspacedata/query/class/gp/"
+                    f"OBJECT_NAME/~~{encoded_name}/ORDINAL/1/format/json"
+                )
+            
+            # Issue all queries concurrently over the pooled session; results come
+            # back in request order so the dedup below stays deterministic
+            responses = _space_track_get(username, password, session, urls)
+            
+            for k, response in enumerate(responses):
+                if response.status_code == 200:
+                    data = _response_json(response)
+                    self.tle_data.extend([(entry['OBJECT_NAME'], entry['TLE_LINE1'], entry['TLE_LINE2']) for entry in data])
                     
-                    # Use 'gp' class and ~~ for case-insensitive LIKE search
-                    url_name = (
-                        "https://www.space-track.org/basicspacedata/query/class/gp/"
-                        f"OBJECT_NAME/~~{encoded_name}/ORDINAL/1/format/json"
-                    )
-                    resp_name = session.get(url_name)
-                    if resp_name.status_code == 200:
-                        data = resp_name.json()
-                        if data:
-                            self.tle_data.extend([(entry['OBJECT_NAME'], entry['TLE_LINE1'], entry['TLE_LINE2']) for entry in data])
+                    # The ID query (always first) is cacheable per satellite
+                    if k == 0 and ids and self.cache is not None and data:
+                        self.cache.set_tle_data(ids, {
+                            str(int(entry['NORAD_CAT_ID'])): {
+                                'OBJECT_NAME': entry['OBJECT_NAME'],
+                                'TLE_LINE1': entry['TLE_LINE1'],
+                                'TLE_LINE2': entry['TLE_LINE2'],
+                            }
+                            for entry in data
+                        })
             
-            # Remove duplicates
+            # Remove duplicates (keyed on the NORAD ID field of line 2, first seen wins)
             if self.tle_data:
                 unique_tles = {}
-                for name, l1, l2 in self.tle_data:
-                    unique_tles[l1+l2] = (name, l1, l2)
+                for entry in self.tle_data:
+                    unique_tles.setdefault(entry[2][2:7], entry)
                 self.tle_data = list(unique_tles.values())
 
             if not self.tle_data:
                 raise Exception(f"No live TLE data found for: {', '.join(identifiers)}")
 
             # Load into skyfield objects
-            self.satellites = []
-            for name, line1, line2 in self.tle_data:
-                try:
-                    sat = EarthSatellite(line1, line2, name, self.ts)
-                    self.satellites.append(sat)
-                except Exception as e:
-                    print(f"Error loading TLE for {name}: {e}")
+            self._load_satellites()
                 
             return True
 
         except Exception as e:
             raise Exception(f"Error fetching live data from Space-Track: {str(e)}")
+        finally:
+            if lock_token is not None:
+                self.cache.release_refresh_lock(lock_ids, lock_token)
 
     def fetch_full_catalog(self, username, password, limit=20000):
         """
         Fetches the full catalog of active satellites (up to limit).
         """
-        session = requests.Session()
-        login_url = "https://www.space-track.org/ajaxauth/login"
-        
         # Login
-        login = session.post(login_url, data={"identity": username, "password": password})
-        if login.status_code != 200:
-            raise Exception(f"Login failed: {login.text}")
+        session = _space_track_session(username, password)
+        if session is None:
+            raise Exception("Login failed: Space-Track rejected the credentials")
 
         # Query: All active objects (DECAY_DATE is null), LEO (MEAN_MOTION > 11.25 ~ period < 128 min)
         # Using 'tle_latest' to get the most recent TLE for each object.
@@ -121,97 +454,166 @@ class OrbitGuardAI:
             f"/limit/{limit}"
         )
         
-        response = session.get(full_url)
+        response, = _space_track_get(username, password, session, [full_url])
         if response.status_code != 200:
             raise Exception(f"Failed to fetch full catalog: {response.text}")
             
-        tle_json = response.json()
+        tle_json = _response_json(response)
         self.tle_data = [(entry['OBJECT_NAME'], entry['TLE_LINE1'], entry['TLE_LINE2']) for entry in tle_json]
-        self.satellites = [EarthSatellite(l1, l2, name) for name, l1, l2 in self.tle_data]
+        self._load_satellites()
+
+    def _load_satellites(self):
+        """
+        Builds self.satellites from self.tle_data, sharing self.ts so skyfield
+        does not set up a default timescale per object. Bad TLEs are skipped.
+        """
+        self.satellites = []
+        for name, line1, line2 in self.tle_data:
+            try:
+                sat = EarthSatellite(line1, line2, name, self.ts)
+                self.satellites.append(sat)
+            except Exception as e:
+                print(f"Error loading TLE for {name}: {e}")
 
     def check_conjunctions(self, interval_minutes=5, duration_minutes=60):
-        times = [self.ts.utc(self.now + timedelta(minutes=i)) for i in range(0, duration_minutes, interval_minutes)]
-        warnings = []
-        for t in times:
-            positions = {sat.name: sat.at(t).position.km for sat in self.satellites}
-            for (name1, pos1), (name2, pos2) in combinations(positions.items(), 2):
-                distance = np.linalg.norm(pos1 - pos2)
-                if distance < self.threshold_km:
-                    warnings.append({
-                        "time_utc": t.utc_strftime('%Y-%m-%d %H:%M:%S'),
-                        "satellite_1": name1,
-                        "satellite_2": name2,
-                        "distance_km": distance
-                    })
-        if warnings:
-            df = pd.DataFrame(warnings)
-            df.to_csv("outputs/conjunction-warning.csv", index=False)
-        return warnings
+        """
+        Screens all satellite pairs for close approaches over the time window.
+        Positions come straight from SGP4 in TEME with no skyfield frame
+        rotation; reported distance_km values are TEME separations, which equal
+        GCRS ones because the frames differ by a rotation common to all objects.
+        """
+        minutes = np.arange(0, duration_minutes, interval_minutes)
+        if not len(minutes):
+            return []
+        # Whole grid in one ts.utc call; the offset seconds roll over into the calendar fields
+        now = self.now
+        t = self.ts.utc(now.year, now.month, now.day, now.hour, now.minute,
+                        now.second + now.microsecond / 1e6 + 60.0 * minutes)
+        r, _ = _propagate_teme(self.satellites, t)
+        find_pairs = _kdtree_close_pairs if SCIPY_AVAILABLE else _screen_close_pairs
+
+        # Hits are gathered as index arrays per step and turned into columns once
+        steps, first, second, distances = [], [], [], []
+        for k, pos in enumerate(r.transpose(1, 0, 2)):
+            i, j, d = find_pairs(pos, self.threshold_km)
+            steps.append(np.full(len(i), k))
+            first.append(i)
+            second.append(j)
+            distances.append(d)
+        labels = np.array(t.utc_strftime('%Y-%m-%d %H:%M:%S'), dtype=object)
+        names = np.array([sat.name for sat in self.satellites], dtype=object)
+        rows = list(zip(
+            labels[np.concatenate(steps)].tolist(),
+            names[np.concatenate(first)].tolist(),
+            names[np.concatenate(second)].tolist(),
+            np.concatenate(distances).astype(np.float64).tolist(),
+        ))
+        if rows:
+            _write_csv("outputs/conjunction-warning.csv", CONJUNCTION_COLUMNS, rows)
+        return [dict(zip(CONJUNCTION_COLUMNS, row)) for row in rows]
 
     def track_ground_passes(self, duration_hours=24):
         start_time = self.ts.utc(self.now.year, self.now.month, self.now.day, self.now.hour)
-        end_time = self.ts.utc((self.now + timedelta(hours=duration_hours)).year,
-                               (self.now + timedelta(hours=duration_hours)).month,
-                               (self.now + timedelta(hours=duration_hours)).day)
-        results = []
-        event_names = ['AOS (Rise)', 'MAX (Peak)', 'LOS (Set)']
+        end = self.now + timedelta(hours=duration_hours)
+        end_time = self.ts.utc(end.year, end.month, end.day)
+        event_names = np.array(['AOS (Rise)', 'MAX (Peak)', 'LOS (Set)'])
+        rows = []
         for sat in self.satellites:
             t, events = sat.find_events(self.station, start_time, end_time, altitude_degrees=10.0)
-            for ti, event in zip(t, events):
-                name = event_names[event]
-                difference = sat.at(ti) - self.station.at(ti)
-                alt, az, _ = difference.altaz()
-                results.append({
-                    "Satellite": sat.name,
-                    "UTC Time": ti.utc_strftime('%Y-%m-%d %H:%M:%S'),
-                    "Event": name,
-                    "Azimuth (deg)": f"{az.degrees:.1f}",
-                    "Elevation (deg)": f"{alt.degrees:.1f}"
-                })
-        df = pd.DataFrame(results)
-        df.to_csv("outputs/plan_s_satellite_passes.csv", index=False)
-        return results
-
-    def generate_2d_map(self, interval_minutes=10, duration_minutes=180):
+            if not len(events):
+                continue
+            # One topocentric evaluation over all of this satellite's event times
+            alt, az, _ = (sat - self.station).at(t).altaz()
+            # Kept numeric (0.1 deg, as displayed) so callers can sort/filter on them
+            rows.extend(zip(
+                [sat.name] * len(events),
+                t.utc_strftime('%Y-%m-%d %H:%M:%S'),
+                event_names[events].tolist(),
+                np.round(az.degrees, 1).tolist(),
+                np.round(alt.degrees, 1).tolist(),
+            ))
+        _write_csv("outputs/plan_s_satellite_passes.csv", PASS_COLUMNS, rows)
+        return [dict(zip(PASS_COLUMNS, row)) for row in rows]
+
+    def _minute_grid(self, interval_minutes, duration_minutes):
+        """
+        Single Time array stepping in whole minutes from the current minute.
+
+        Nutation is pre-seeded with the truncated IAU2000B series (skyfield's
+        documented shortcut); at map resolution it is indistinguishable from
+        IAU2000A and several times cheaper to evaluate.
+        """
+        minutes = np.arange(0, duration_minutes, interval_minutes)
+        t = self.ts.utc(self.now.year, self.now.month, self.now.day,
+                        self.now.hour, self.now.minute + minutes)
+        t._nutation_angles_radians = iau2000b_radians(t)
+        return t
+
+    def _ground_tracks(self, t):
+        """
+        Geodetic subpoints of every satellite over an array-valued Time.
+
+        All satellites are propagated in one SatrecArray call and rotated
+        TEME -> ITRS -> WGS84 as a single (3, N, T) array.
+
+        Returns:
+            Tuple of (N, T) latitude and longitude arrays in degrees
+        """
+        r, v = _propagate_teme(self.satellites, t)
+        if not self.satellites:
+            return r[..., 0], r[..., 0]
+        position = Geocentric.from_time_and_frame_vectors(
+            t, TEME, Distance(km=r.transpose(2, 0, 1)), Velocity(km_per_s=v.transpose(2, 0, 1))
+        )
+        lat, lon = wgs84.latlon_of(position)
+        return lat.degrees, lon.degrees
+
+    def compute_tracks(self, interval_minutes, duration_minutes):
+        """
+        Ground tracks both map renderers can share.
+
+        Returns:
+            Tuple of (interval_minutes, lat, lon) with (N, T) arrays in degrees
+        """
+        t = self._minute_grid(interval_minutes, duration_minutes)
+        return (interval_minutes, *self._ground_tracks(t))
+
+    def _tracks_for(self, tracks, interval_minutes, duration_minutes):
+        """
+        Strides precomputed tracks down to the requested grid, or propagates
+        afresh when they are too coarse or too short to cover it.
+        """
+        steps = len(range(0, duration_minutes, interval_minutes))
+        if tracks is not None:
+            step, lat, lon = tracks
+            stride = interval_minutes // step
+            if interval_minutes % step == 0 and (steps - 1) * stride < lat.shape[1]:
+                return lat[:, ::stride][:, :steps], lon[:, ::stride][:, :steps]
+        return self.compute_tracks(interval_minutes, duration_minutes)[1:]
+
+    def generate_2d_map(self, interval_minutes=10, duration_minutes=180, tracks=None):
         m = folium.Map(location=[0, 0], zoom_start=2, tiles="CartoDB positron")
-        for name, l1, l2 in self.tle_data:
-            sat = EarthSatellite(l1, l2, name)
-            points = []
-            for minutes in range(0, duration_minutes, interval_minutes):
-                future_time = self.now + timedelta(minutes=minutes)
-                t = self.ts.utc(future_time.year, future_time.month, future_time.day,
-                                future_time.hour, future_time.minute)
-                subpoint = wgs84.subpoint(sat.at(t))
-                lat = subpoint.latitude.degrees
-                lon = subpoint.longitude.degrees
-                
-                if not (np.isnan(lat) or np.isnan(lon)):
-                    points.append((lat, lon))
+        lat_all, lon_all = self._tracks_for(tracks, interval_minutes, duration_minutes)
+        for sat, lat, lon in zip(self.satellites, lat_all, lon_all):
+            valid = ~(np.isnan(lat) | np.isnan(lon))
+            points = list(zip(lat[valid].tolist(), lon[valid].tolist()))
             
             if points:
-                folium.Marker(location=points[0], tooltip=f"{name} Start").add_to(m)
-                folium.PolyLine(points, color="blue", weight=2.5, opacity=0.8, tooltip=name).add_to(m)
+                folium.Marker(location=points[0], tooltip=f"{sat.name} Start").add_to(m)
+                folium.PolyLine(points, color="blue", weight=2.5, opacity=0.8, tooltip=sat.name).add_to(m)
         m.save("outputs/satellite_track_2d.html")
 
-    def generate_3d_map(self, interval_minutes=5, duration_minutes=180):
+    def generate_3d_map(self, interval_minutes=5, duration_minutes=180, tracks=None):
         fig = go.Figure()
-        for name, l1, l2 in self.tle_data:
-            sat = EarthSatellite(l1, l2, name)
-            lats, lons = [], []
-            for minutes in range(0, duration_minutes, interval_minutes):
-                future_time = self.now + timedelta(minutes=minutes)
-                t = self.ts.utc(future_time.year, future_time.month, future_time.day,
-                                future_time.hour, future_time.minute)
-                subpoint = wgs84.subpoint(sat.at(t))
-                lats.append(subpoint.latitude.degrees)
-                lons.append(subpoint.longitude.degrees)
+        lat_all, lon_all = self._tracks_for(tracks, interval_minutes, duration_minutes)
+        for sat, lat, lon in zip(self.satellites, lat_all, lon_all):
             fig.add_trace(go.Scattergeo(
-                lat=lats,
-                lon=lons,
+                lat=lat,
+                lon=lon,
                 mode='lines+markers',
                 line=dict(width=2),
                 marker=dict(size=4),
-                name=name
+                name=sat.name
             ))
         fig.add_trace(go.Scattergeo(
             lat=[self.observer_lat],
@@ -235,6 +637,8 @@ class OrbitGuardAI:
         self.station = wgs84.latlon(self.observer_lat, self.observer_lon, self.elevation_m)
         self.check_conjunctions()
         self.track_ground_passes()
-        self.generate_2d_map()
-        self.generate_3d_map()
+        # One propagation on the 3D map's 5-minute grid; the 2D map strides it to 10
+        tracks = self.compute_tracks(5, 180)
+        self.generate_2d_map(tracks=tracks)
+        self.generate_3d_map(tracks=tracks)
         print("✅ All analysis completed and exported to 'outputs/' folder.")
@@ -4,13 +4,29 @@ Provides 5-10x speedup for multi-satellite analysis
 """
 
 import asyncio
+import json
+import random
 import aiohttp
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import logging
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Decoder handed to aiohttp's resp.json() (orjson accepts the decoded text too)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Retry delay ceiling (seconds) for the exponential backoff
+MAX_BACKOFF_S = 30.0
+# NORAD IDs per comma-separated query (keeps URLs well under server limits)
+QUERY_CHUNK_SIZE = 200
+
 
 class AsyncOrbitAgent:
     """
@@ -70,6 +86,11 @@ class AsyncOrbitAgent:
             logger.error(f"❌ Authentication error: {e}")
             raise
     
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with jitter so retries do not fire in lockstep."""
+        return min(2 ** attempt + random.random(), MAX_BACKOFF_S)
+    
     async def fetch_single_tle(self, norad_id: int, retries: int = 3) -> Optional[Dict]:
         """
         Fetch TLE for a single satellite.
@@ -88,7 +109,7 @@ class AsyncOrbitAgent:
             try:
                 async with self.session.get(url) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=_json_loads)
                         if data and len(data) > 0:
                             logger.debug(f"✅ Fetched TLE for {norad_id}")
                             return data[0]
@@ -99,8 +120,9 @@ class AsyncOrbitAgent:
                         logger.warning(f"⚠️  HTTP {resp.status} for {norad_id}")
             except Exception as e:
                 logger.error(f"❌ Error fetching {norad_id} (attempt {attempt+1}): {e}")
-                if attempt < retries - 1:
-                    await asyncio.sleep(1)  # Wait before retry
+            
+            if attempt < retries - 1:
+                await asyncio.sleep(self._backoff(attempt))  # Wait before retry
         
         return None
     
@@ -144,20 +166,11 @@ class AsyncOrbitAgent:
         Returns:
             Dict mapping NORAD ID to TLE data
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def fetch_with_sem(norad_id):
-            async with semaphore:
-                return await self.fetch_single_tle(norad_id)
-        
         logger.info(f"📡 Fetching {len(norad_ids)} satellites (max {max_concurrent} concurrent)...")
         start_time = datetime.now()
         
-        tasks = [fetch_with_sem(nid) for nid in norad_ids]
-        results = await asyncio.gather(*tasks)
-        
         tle_dict = {}
-        for norad_id, tle_data in zip(norad_ids, results):
+        async for norad_id, tle_data in self.iter_batch_tle(norad_ids, max_concurrent):
             if tle_data:
                 tle_dict[norad_id] = tle_data
         
@@ -165,6 +178,70 @@ class AsyncOrbitAgent:
         logger.info(f"✅ Fetched {len(tle_dict)}/{len(norad_ids)} satellites in {elapsed:.2f}s")
         
         return tle_dict
+    
+    async def fetch_batch_single_query(self, norad_ids: List[int],
+                                       chunk_size: int = QUERY_CHUNK_SIZE) -> Dict[int, Dict]:
+        """
+        Fetch TLE data with one comma-separated Space-Track query per chunk.
+        
+        A single request replaces N round trips in the common case. A chunk
+        whose query fails falls back to per-ID fetching for just those IDs.
+        
+        Args:
+            norad_ids: List of NORAD catalog IDs
+            chunk_size: Maximum IDs per query
+            
+        Returns:
+            Dict mapping NORAD ID to TLE data
+        """
+        logger.info(f"📡 Fetching {len(norad_ids)} satellites (single query)...")
+        start_time = datetime.now()
+        
+        async def fetch_chunk(chunk):
+            url = (f"{self.base_url}/basicspacedata/query/class/tle_latest/"
+                   f"NORAD_CAT_ID/{','.join(map(str, chunk))}/ORDINAL/1/format/json")
+            try:
+                async with self.session.get(url) as resp:
+                    if resp.status == 200:
+                        return {int(entry['NORAD_CAT_ID']): entry for entry in await resp.json(loads=_json_loads)}
+                    logger.warning(f"⚠️  HTTP {resp.status} for {len(chunk)}-ID query, falling back")
+            except Exception as e:
+                logger.error(f"❌ Error fetching {len(chunk)}-ID query: {e}, falling back")
+            return await self.fetch_batch_with_semaphore(chunk)
+        
+        chunks = [norad_ids[i:i + chunk_size] for i in range(0, len(norad_ids), chunk_size)]
+        tle_dict = {}
+        for result in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+            tle_dict.update(result)
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ Fetched {len(tle_dict)}/{len(norad_ids)} satellites in {elapsed:.2f}s")
+        
+        return tle_dict
+    
+    async def iter_batch_tle(self, norad_ids: List[int],
+                             max_concurrent: int = 10) -> AsyncIterator[Tuple[int, Optional[Dict]]]:
+        """
+        Yield (norad_id, tle_data) pairs as each fetch completes.
+        
+        Lets callers start processing early results while slower requests
+        are still in flight.
+        
+        Args:
+            norad_ids: List of NORAD catalog IDs
+            max_concurrent: Maximum concurrent requests
+            
+        Yields:
+            Tuple of NORAD ID and TLE data dict (None on failure)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def fetch_with_sem(norad_id):
+            async with semaphore:
+                return norad_id, await self.fetch_single_tle(norad_id)
+        
+        for next_done in asyncio.as_completed([fetch_with_sem(nid) for nid in norad_ids]):
+            yield await next_done
 
 
 def run_sync(norad_ids: List[int], username: str, password: str) -> Dict[int, Dict]:
@@ -182,7 +259,7 @@ def run_sync(norad_ids: List[int], username: str, password: str) -> Dict[int, Di
     """
     async def _fetch():
         async with AsyncOrbitAgent(username, password) as agent:
-            return await agent.fetch_batch_tle(norad_ids)
+            return await agent.fetch_batch_single_query(norad_ids)
     
     # Create new event loop for sync context
     loop = asyncio.new_event_loop()
@@ -1,6 +1,29 @@
+import math
 import numpy as np
 from skyfield.api import EarthSatellite, wgs84
 from skyfield.elementslib import osculating_elements_of
+from skyfield.positionlib import Geocentric
+from skyfield.sgp4lib import TEME
+from skyfield.units import Distance, Velocity
+from sgp4.api import SatrecArray, jday
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _elements_dict(elements):
+    """Engine element dict from skyfield OsculatingElements (scalars or arrays)."""
+    return {
+        'a': elements.semi_major_axis.km,
+        'e': elements.eccentricity,
+        'i': elements.inclination.radians,
+        'om': elements.longitude_of_ascending_node.radians, # Omega
+        'w': elements.argument_of_periapsis.radians,        # omega
+        'v': elements.true_anomaly.radians,                 # nu
+        'n': elements.mean_motion_per_day.degrees * (np.pi/180) / 86400 # rad/s
+    }
 
 class ScientificSatellite:
     """
@@ -12,6 +35,8 @@ class ScientificSatellite:
         self.name = satellite.name
         self.norad_id = satellite.model.satnum
         self.orbital_elements = None
+        # (t.tt, elements dict) of the last computation, so repeat calls at the same t are free
+        self._elements_at = None
         self.criticality_score = 0.0
         self.occupation_ratio = 0.0
         self.nodal_frequencies = []
@@ -24,19 +49,98 @@ class ScientificSatellite:
             else:
                 raise ValueError("Time t cannot be None if orbital_elements is not set.")
 
+        if self.has_elements_at(t):
+            return self.orbital_elements
+
         position = self.sat.at(t)
         elements = osculating_elements_of(position)
-        
-        self.orbital_elements = {
-            'a': elements.semi_major_axis.km,
-            'e': elements.eccentricity,
-            'i': elements.inclination.radians,
-            'om': elements.longitude_of_ascending_node.radians, # Omega
-            'w': elements.argument_of_periapsis.radians,        # omega
-            'v': elements.true_anomaly.radians,                 # nu
-            'n': elements.mean_motion_per_day.degrees * (np.pi/180) / 86400 # rad/s
-        }
-        return self.orbital_elements
+        return self._store_elements(t, _elements_dict(elements))
+
+    def has_elements_at(self, t):
+        """True if orbital_elements were computed at exactly time t and not replaced since."""
+        return (self._elements_at is not None
+                and self._elements_at[1] is self.orbital_elements
+                and self._elements_at[0] == t.tt)
+
+    def _store_elements(self, t, elements):
+        self.orbital_elements = elements
+        self._elements_at = (t.tt, elements)
+        return elements
+
+def _node_kernel(i1, om1, w1, a1, e1, n1, i2, om2, w2, a2, e2, n2):
+    """
+    Scalar core of KeplerianEngine.calculate_conjunction_nodes.
+
+    Same math as find_intersection_line and get_perifocal_rotation_matrix,
+    written out without arrays or dicts so it compiles cleanly under numba.
+
+    Returns:
+        (parallel, Lx, Ly, Lz, diff_plus, diff_minus, T_c_days) where the
+        diffs are the radius differences at the +L and -L nodes and T_c_days
+        is 0.0 when the mean motions are equal (no synodic period)
+    """
+    # Plane normals h = [sin(i)sin(om), -sin(i)cos(om), cos(i)]
+    h1x, h1y, h1z = math.sin(i1) * math.sin(om1), -math.sin(i1) * math.cos(om1), math.cos(i1)
+    h2x, h2y, h2z = math.sin(i2) * math.sin(om2), -math.sin(i2) * math.cos(om2), math.cos(i2)
+    
+    # Intersection line L = h1 x h2
+    Lx = h1y * h2z - h1z * h2y
+    Ly = h1z * h2x - h1x * h2z
+    Lz = h1x * h2y - h1y * h2x
+    norm_L = math.sqrt(Lx * Lx + Ly * Ly + Lz * Lz)
+    if norm_L < 1e-6:
+        return True, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    Lx /= norm_L
+    Ly /= norm_L
+    Lz /= norm_L
+    
+    # Node direction in each perifocal frame (Q^T @ L, first two rows only);
+    # the -L node is the same angle rotated by pi
+    r1 = _node_radius(i1, om1, w1, a1, e1, Lx, Ly, Lz)
+    r2 = _node_radius(i2, om2, w2, a2, e2, Lx, Ly, Lz)
+    r1_neg = _node_radius(i1, om1, w1, a1, e1, -Lx, -Ly, -Lz)
+    r2_neg = _node_radius(i2, om2, w2, a2, e2, -Lx, -Ly, -Lz)
+    
+    # Synodic period (time between conjunctions at the same node)
+    T_c_days = 0.0
+    if abs(n1 - n2) > 1e-9:
+        T_c_days = (2 * math.pi) / abs(n1 - n2) / 86400.0
+    return False, Lx, Ly, Lz, abs(r1 - r2), abs(r1_neg - r2_neg), T_c_days
+
+def _node_radius(i, om, w, a, e, x, y, z):
+    """Orbit radius r = a(1-e^2) / (1 + e*cos(v)) along the unit vector (x, y, z)."""
+    sin_i, cos_i = math.sin(i), math.cos(i)
+    sin_om, cos_om = math.sin(om), math.cos(om)
+    sin_w, cos_w = math.sin(w), math.cos(w)
+    px = (cos_om * cos_w - sin_om * sin_w * cos_i) * x \
+        + (sin_om * cos_w + cos_om * sin_w * cos_i) * y + (sin_w * sin_i) * z
+    py = (-cos_om * sin_w - sin_om * cos_w * cos_i) * x \
+        + (-sin_om * sin_w + cos_om * cos_w * cos_i) * y + (cos_w * sin_i) * z
+    v = math.atan2(py, px)
+    return (a * (1 - e ** 2)) / (1 + e * math.cos(v))
+
+if NUMBA_AVAILABLE:
+    # No fastmath: keeps results identical to the pure-Python fallback
+    _node_radius = numba.njit(cache=True)(_node_radius)
+    _node_kernel = numba.njit(cache=True)(_node_kernel)
+
+    @numba.njit(cache=True)
+    def _node_kernel_batch(el1, el2):
+        """
+        Runs _node_kernel over P pairs of (i, om, w, a, e, n) element rows.
+
+        Returns:
+            The kernel's seven outputs as length-P arrays
+        """
+        P = el1.shape[0]
+        parallel = np.empty(P, np.bool_)
+        out = np.empty((6, P))
+        for p in range(P):
+            (parallel[p], out[0, p], out[1, p], out[2, p],
+             out[3, p], out[4, p], out[5, p]) = _node_kernel(
+                el1[p, 0], el1[p, 1], el1[p, 2], el1[p, 3], el1[p, 4], el1[p, 5],
+                el2[p, 0], el2[p, 1], el2[p, 2], el2[p, 3], el2[p, 4], el2[p, 5])
+        return parallel, out[0], out[1], out[2], out[3], out[4], out[5]
 
 class KeplerianEngine:
     """
@@ -48,6 +152,45 @@ class KeplerianEngine:
         self.tolerance_km = tolerance_km
         self.mu = 398600.4418 # Earth gravitational parameter km^3/s^2
 
+    def prepare(self, satellites, t):
+        """
+        Computes orbital elements for all satellites at time t in one batch.
+
+        SGP4 runs once over a SatrecArray and the TEME vectors are rotated
+        to GCRS through skyfield's public frame API (as orbit_agent's ground
+        tracks do); elements agree with sat.at(t) to ~1e-13. Satellites SGP4
+        cannot propagate to t get NaN elements. Later calculate_elements(t)
+        calls are cache hits. Objects other than ScientificSatellite fall
+        back to calculate_elements.
+        """
+        if t is None:
+            return satellites
+        pending = []
+        for s in satellites:
+            if not isinstance(s, ScientificSatellite):
+                s.calculate_elements(t)
+            elif not s.has_elements_at(t):
+                pending.append(s)
+        if not pending:
+            return satellites
+
+        # SGP4 takes UTC Julian dates, as EarthSatellite does
+        jd, fr = (np.array([x], dtype=np.float64) for x in jday(*t.utc))
+        errors, r, v = SatrecArray([s.sat.model for s in pending]).sgp4(jd, fr)
+        failed = errors[:, 0] != 0
+        r, v = r[:, 0], v[:, 0]
+        r[failed] = np.nan
+        v[failed] = np.nan
+
+        position = Geocentric.from_time_and_frame_vectors(
+            t, TEME, Distance(km=r.T), Velocity(km_per_s=v.T)
+        )
+        with np.errstate(invalid='ignore'):
+            columns = _elements_dict(osculating_elements_of(position))
+        for k, s in enumerate(pending):
+            s._store_elements(t, {key: col[k] for key, col in columns.items()})
+        return satellites
+
     def get_orbital_plane_normal(self, i, om):
         """Calculates the normal vector of the orbital plane."""
         # Normal vector h = [sin(i)sin(om), -sin(i)cos(om), cos(i)]
@@ -169,71 +312,31 @@ class KeplerianEngine:
         if not self.check_apogee_perigee_filter(sat1, sat2, t):
             return []
 
-        # 2. Find Intersection Line
-        L_unit = self.find_intersection_line(el1, el2)
-        if L_unit is None:
+        # 2. Intersection line and radius difference at both nodes
+        parallel, Lx, Ly, Lz, diff_plus, diff_minus, T_c_days = _node_kernel(
+            el1['i'], el1['om'], el1['w'], el1['a'], el1['e'], el1['n'],
+            el2['i'], el2['om'], el2['w'], el2['a'], el2['e'], el2['n'],
+        )
+        if parallel:
             return []
 
         nodes = []
         # Check both directions of the intersection line
-        for direction in [1, -1]:
-            node_vector = L_unit * direction
-            
-            # 3. Calculate Radius at Node for Sat 1
-            # Transform node vector to Perifocal frame of Sat 1
-            Q1 = self.get_perifocal_rotation_matrix(el1['i'], el1['om'], el1['w'])
-            r_perifocal_1 = Q1.T @ node_vector
-            
-            # True anomaly v is angle in orbital plane
-            # r_perifocal = [r*cos(v), r*sin(v), 0]
-            # So v = atan2(y, x)
-            v1 = np.arctan2(r_perifocal_1[1], r_perifocal_1[0])
-            
-            # Radius r = a(1-e^2) / (1 + e*cos(v))
-            r1 = (el1['a'] * (1 - el1['e']**2)) / (1 + el1['e'] * np.cos(v1))
-            
-            # 4. Calculate Radius at Node for Sat 2
-            Q2 = self.get_perifocal_rotation_matrix(el2['i'], el2['om'], el2['w'])
-            r_perifocal_2 = Q2.T @ node_vector
-            v2 = np.arctan2(r_perifocal_2[1], r_perifocal_2[0])
-            r2 = (el2['a'] * (1 - el2['e']**2)) / (1 + el2['e'] * np.cos(v2))
-            
-            # 5. Check Distance Difference
-            distance_diff = abs(r1 - r2)
-            
-            if distance_diff <= self.tolerance_km:
-                # Calculate Nodal Frequency (f_nc)
-                # Tc = Common Period
-                # T1 = 2*pi / n1, T2 = 2*pi / n2
-                # Tc approx 1 / |1/T1 - 1/T2| for synodic? 
-                # Paper definition: Tc is the time interval between encounters.
-                # Simplified: f_nc = 1 / Tc. 
-                # For now, we use the relative mean motion.
-                
-                n1 = el1['n']
-                n2 = el2['n']
+        for direction, distance_diff in ((1, diff_plus), (-1, diff_minus)):
+            # Keep nodes within tolerance, dropping Tc < 0.2 days (constellation members)
+            if distance_diff <= self.tolerance_km and T_c_days >= 0.2:
+                node_vector = np.array([Lx, Ly, Lz]) * direction
+                # Paper says "monthly conjunction frequency": freq/month = 30 / Tc
+                f_nc = 30.0 / T_c_days
                 
-                # Synodic period (time between conjunctions at the same node)
-                # T_syn = 2*pi / |n1 - n2|
-                if abs(n1 - n2) > 1e-9:
-                    T_c = (2 * np.pi) / abs(n1 - n2) # seconds
-                    T_c_days = T_c / 86400.0
-                    
-                    # Filter if Tc < 0.2 days (constellation members)
-                    if T_c_days >= 0.2:
-                        f_nc = 1.0 / (T_c_days / 30.0) # Frequency per month? 
-                        # Paper says "monthly conjunction frequency". 
-                        # If Tc is period in days, freq/month = 30 / Tc
-                        f_nc = 30.0 / T_c_days
-                        
-                        nodes.append({
-                            'node_vector': node_vector,
-                            'distance_diff_km': distance_diff,
-                            'lat': np.degrees(np.arcsin(node_vector[2])), # Simple lat
-                            'lon': np.degrees(np.arctan2(node_vector[1], node_vector[0])),
-                            'f_nc': f_nc,
-                            'T_c_days': T_c_days
-                        })
+                nodes.append({
+                    'node_vector': node_vector,
+                    'distance_diff_km': distance_diff,
+                    'lat': np.degrees(np.arcsin(node_vector[2])), # Simple lat
+                    'lon': np.degrees(np.arctan2(node_vector[1], node_vector[0])),
+                    'f_nc': f_nc,
+                    'T_c_days': T_c_days
+                })
 
         return nodes
 
@@ -247,15 +350,34 @@ class KeplerianEngine:
             s.criticality_score = 0.0
             s.nodal_frequencies = []
 
-        # Pairwise check
-        import itertools
-        pairs = list(itertools.combinations(satellites, 2))
-        
-        for sat1, sat2 in pairs:
-            nodes = self.calculate_conjunction_nodes(sat1, sat2, t)
-            for node in nodes:
-                f_nc = node['f_nc']
-                
+        if len(satellites) < 2:
+            return satellites
+
+        # Elements once per satellite, as (N, 6) rows of (i, om, w, a, e, n)
+        self.prepare(satellites, t)
+        el = np.array([
+            [els['i'], els['om'], els['w'], els['a'], els['e'], els['n']]
+            for els in (s.calculate_elements(t) for s in satellites)
+        ], dtype=np.float64)
+        
+        # Only pairs with overlapping height bands can have nodes (same test as
+        # check_apogee_perigee_filter), visited in itertools.combinations order
+        a, e = el[:, 3], el[:, 4]
+        first, second = self._overlapping_band_pairs(a * (1 - e), a * (1 + e))
+        lo, hi = np.minimum(first, second), np.maximum(first, second)
+        order = np.lexsort((hi, lo))
+        lo, hi = lo[order], hi[order]
+        
+        # Node geometry for every candidate pair in one batch
+        parallel, _, _, _, diff_plus, diff_minus, T_c_days = self._pair_nodes(el[lo], el[hi])
+        in_period = ~parallel & (T_c_days >= 0.2)
+        keep_plus = in_period & (diff_plus <= self.tolerance_km)
+        keep_minus = in_period & (diff_minus <= self.tolerance_km)
+        
+        for p in np.flatnonzero(keep_plus | keep_minus):
+            sat1, sat2 = satellites[lo[p]], satellites[hi[p]]
+            f_nc = 30.0 / T_c_days[p]
+            for _ in range(int(keep_plus[p]) + int(keep_minus[p])):
                 # Add to both satellites
                 sat1.criticality_score += f_nc
                 sat2.criticality_score += f_nc
@@ -265,6 +387,45 @@ class KeplerianEngine:
                 
         return satellites
 
+    def _pair_nodes(self, el1, el2):
+        """
+        Batched _node_kernel over (P, 6) element rows of (i, om, w, a, e, n).
+
+        Uses the compiled loop when numba is installed, otherwise
+        _pair_nodes_numpy.
+        """
+        if NUMBA_AVAILABLE:
+            return _node_kernel_batch(el1, el2)
+        return self._pair_nodes_numpy(el1, el2)
+
+    def _pair_nodes_numpy(self, el1, el2):
+        """The _node_kernel geometry broadcast over all P pairs with NumPy."""
+        i1, om1, w1, a1, e1, n1 = el1.T
+        i2, om2, w2, a2, e2, n2 = el2.T
+        h1 = np.stack([np.sin(i1) * np.sin(om1), -np.sin(i1) * np.cos(om1), np.cos(i1)], axis=-1)
+        h2 = np.stack([np.sin(i2) * np.sin(om2), -np.sin(i2) * np.cos(om2), np.cos(i2)], axis=-1)
+        L = np.cross(h1, h2)
+        norm_L = np.linalg.norm(L, axis=-1)
+        parallel = norm_L < 1e-6
+        L /= np.where(parallel, 1.0, norm_L)[:, None]
+
+        def node_radii(i, om, w, a, e):
+            # (P, 3, 3) perifocal rotations; Q^T @ L for every pair at once
+            Q = np.moveaxis(self.get_perifocal_rotation_matrix(i, om, w), -1, 0)
+            r_perifocal = np.einsum('pji,pj->pi', Q, L)
+            p = a * (1 - e ** 2)
+            v = np.arctan2(r_perifocal[:, 1], r_perifocal[:, 0])
+            v_neg = np.arctan2(-r_perifocal[:, 1], -r_perifocal[:, 0])
+            return p / (1 + e * np.cos(v)), p / (1 + e * np.cos(v_neg))
+
+        r1, r1_neg = node_radii(i1, om1, w1, a1, e1)
+        r2, r2_neg = node_radii(i2, om2, w2, a2, e2)
+        dn = np.abs(n1 - n2)
+        with np.errstate(divide='ignore'):
+            T_c_days = np.where(dn > 1e-9, (2 * np.pi) / dn / 86400.0, 0.0)
+        return (parallel, L[:, 0], L[:, 1], L[:, 2],
+                np.abs(r1 - r2), np.abs(r1_neg - r2_neg), T_c_days)
+
     def check_apogee_perigee_filter(self, sat1, sat2, t):
         """
         Checks if the height bands of two satellites overlap.
@@ -292,72 +453,43 @@ class KeplerianEngine:
             return []
 
         # 1. Extract Apogee/Perigee for all satellites
-        # We need to compute elements first if not already done
-        # This might be slow for 20k objects if done one by one.
-        # Ideally, we should have these pre-computed or cached.
-        
-        perigees = np.zeros(n)
-        apogees = np.zeros(n)
-        
-        for i, sat in enumerate(satellites):
+        # Elements are only computed for satellites that do not have them yet;
+        # the band edges are then two array expressions over all satellites.
+        for sat in satellites:
             if sat.orbital_elements is None:
                 sat.calculate_elements(t)
-            
-            el = sat.orbital_elements
-            perigees[i] = el['a'] * (1 - el['e'])
-            apogees[i] = el['a'] * (1 + el['e'])
-            
-        # 2. Sort by Perigee
-        sorted_indices = np.argsort(perigees)
-        sorted_perigees = perigees[sorted_indices]
-        sorted_apogees = apogees[sorted_indices]
-        
-        candidate_pairs = []
-        
-        # 3. Sweep and Prune
-        # For each satellite i, look for satellites j where Perigee_j <= Apogee_i + tolerance
-        # Since we are sorted by Perigee, we can stop checking when Perigee_j > Apogee_i + tolerance
         
-        # Note: This is still O(N*M) where M is the number of overlaps, but M << N usually.
-        # For a full vectorized approach without loops, we can use broadcasting but that's O(N^2) memory.
-        # We'll use a compiled loop or optimized search.
-        
-        for i in range(n):
-            idx_i = sorted_indices[i]
-            ap_i = sorted_apogees[i]
-            
-            # We only need to check j > i because pairs are symmetric
-            # But wait, sorting breaks the symmetry check i < j. 
-            # We need to check all j where Perigee_j overlaps with [Perigee_i, Apogee_i]
-            # Actually, two orbits overlap if max(P1, P2) <= min(A1, A2) + tol
-            
-            # Let's stick to the simple loop over sorted array for now.
-            # We want pairs (i, j) such that overlap is true.
-            
-            # Optimization: 
-            # We iterate i from 0 to n.
-            # We iterate j from i+1 to n.
-            # If Perigee_j > Apogee_i + tol, then for all k > j, Perigee_k > Apogee_i + tol (since sorted).
-            # So we can break the inner loop.
+        a = np.fromiter((s.orbital_elements['a'] for s in satellites), dtype=np.float64, count=n)
+        e = np.fromiter((s.orbital_elements['e'] for s in satellites), dtype=np.float64, count=n)
+        perigees = a * (1 - e)
+        apogees = a * (1 + e)
             
-            # However, we must ensure we catch all pairs.
-            # The condition is max(P_i, P_j) <= min(A_i, A_j) + tol
-            # Since j > i and sorted, P_j >= P_i. So max(P_i, P_j) = P_j.
-            # So condition becomes: P_j <= min(A_i, A_j) + tol
-            # This implies P_j <= A_i + tol AND P_j <= A_j + tol.
-            # The second part is always true (Perigee <= Apogee).
-            # So we just need P_j <= A_i + tol.
-            
-            limit = ap_i + self.tolerance_km
-            
-            for j in range(i + 1, n):
-                if sorted_perigees[j] > limit:
-                    break
-                
-                idx_j = sorted_indices[j]
-                candidate_pairs.append((satellites[idx_i], satellites[idx_j]))
-                
-        return candidate_pairs
+        # 2. Sweep and Prune over perigee-sorted bands
+        first, second = self._overlapping_band_pairs(perigees, apogees)
+        return [(satellites[i], satellites[j]) for i, j in zip(first.tolist(), second.tolist())]
+
+    def _overlapping_band_pairs(self, perigees, apogees):
+        """
+        Index pairs (i, j) whose [perigee, apogee] bands overlap within tolerance.
+
+        After sorting by perigee, every j > i overlaps i as long as
+        P_j <= A_i + tol (max(P_i, P_j) = P_j and P_j <= A_j always holds), so
+        each row's partners are one contiguous run ending at a searchsorted bound.
+        """
+        n = len(perigees)
+        order = np.argsort(perigees)
+        sorted_perigees = perigees[order]
+        limits = apogees[order] + self.tolerance_km
+        
+        # First sorted position past each row's run; always >= i + 1
+        ends = np.searchsorted(sorted_perigees, limits, side='right')
+        counts = np.maximum(ends - np.arange(1, n + 1), 0)
+        
+        # Expand the runs into flat pair arrays without a Python loop
+        rows = np.repeat(np.arange(n), counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        cols = rows + 1 + (np.arange(len(rows)) - run_starts)
+        return order[rows], order[cols]
 
 class J2Propagator:
     """
@@ -56,6 +56,74 @@ async def test_concurrent_fetch_structure():
     assert hasattr(agent, 'fetch_batch_with_semaphore')
 
 
+def test_backoff_grows_and_is_capped():
+    """Test retry delay doubles per attempt with jitter, up to the cap."""
+    from orbit_agent_async import MAX_BACKOFF_S
+    
+    for attempt in range(4):
+        delay = AsyncOrbitAgent._backoff(attempt)
+        assert 2 ** attempt <= delay < 2 ** attempt + 1
+    assert AsyncOrbitAgent._backoff(10) == MAX_BACKOFF_S
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_tle_yields_as_completed():
+    """Test streamed results arrive in completion order, tagged with their ID."""
+    agent = AsyncOrbitAgent(TEST_USERNAME, TEST_PASSWORD)
+    
+    async def fake_fetch(norad_id, retries=3):
+        await asyncio.sleep(0.01 * norad_id)
+        return {'NORAD_CAT_ID': str(norad_id)}
+    
+    agent.fetch_single_tle = fake_fetch
+    results = [nid async for nid, _ in agent.iter_batch_tle([3, 1, 2])]
+    assert results == [1, 2, 3]
+
+
+class _FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        pass
+    
+    async def json(self, loads=None):
+        return self._payload
+
+
+class _FakeSession:
+    """Answers comma-separated NORAD_CAT_ID queries from a fixed catalog."""
+    
+    def __init__(self, known_ids):
+        self.known_ids = set(known_ids)
+        self.urls = []
+    
+    def get(self, url):
+        self.urls.append(url)
+        ids = url.split('/NORAD_CAT_ID/')[1].split('/')[0].split(',')
+        return _FakeResponse(200, [
+            {'NORAD_CAT_ID': nid, 'OBJECT_NAME': f'SAT {nid}'}
+            for nid in ids if int(nid) in self.known_ids
+        ])
+
+
+@pytest.mark.asyncio
+async def test_fetch_batch_single_query_chunks():
+    """Test IDs are fetched with one query per chunk and keyed by int ID."""
+    agent = AsyncOrbitAgent(TEST_USERNAME, TEST_PASSWORD)
+    agent.session = _FakeSession(known_ids=range(1, 5))
+    
+    result = await agent.fetch_batch_single_query([1, 2, 3, 4, 99], chunk_size=2)
+    
+    assert len(agent.session.urls) == 3
+    assert sorted(result) == [1, 2, 3, 4]
+    assert result[3]['OBJECT_NAME'] == 'SAT 3'
+
+
 def test_agent_attributes():
     """Test agent has correct attributes."""
     agent = AsyncOrbitAgent(TEST_USERNAME, TEST_PASSWORD)
@@ -80,6 +80,40 @@ def test_cache_expiration():
     assert result2 is None
 
 
+def test_refresh_lock_single_flight(cache):
+    """Test that only one worker wins the refresh lock for a query."""
+    norad_ids = [25544, 48274]
+    cache.client.delete(cache._lock_key(norad_ids))
+    
+    token = cache.acquire_refresh_lock(norad_ids)
+    assert token is not None
+    assert cache.acquire_refresh_lock(norad_ids) is None
+    
+    # Losers see nothing to wait for once the winner releases without data
+    cache.release_refresh_lock(norad_ids, token)
+    assert cache.wait_for_tle_data(norad_ids, timeout=1) is None
+    token = cache.acquire_refresh_lock(norad_ids)
+    assert token is not None
+    cache.release_refresh_lock(norad_ids, token)
+
+
+def test_refresh_lock_release_checks_owner(cache):
+    """Test a worker whose lock expired cannot release the next owner's lock."""
+    norad_ids = [25544, 48274]
+    lock_key = cache._lock_key(norad_ids)
+    cache.client.delete(lock_key)
+    
+    stale_token = cache.acquire_refresh_lock(norad_ids)
+    cache.client.delete(lock_key)  # lock expires
+    token = cache.acquire_refresh_lock(norad_ids)
+    
+    cache.release_refresh_lock(norad_ids, stale_token)
+    assert cache.client.get(lock_key) == token
+    
+    cache.release_refresh_lock(norad_ids, token)
+    assert not cache.client.exists(lock_key)
+
+
 def test_cache_invalidation(cache):
     """Test manual cache invalidation."""
     # Add some data
@@ -126,6 +160,18 @@ def test_multiple_satellites(cache):
     assert all(str(nid) in retrieved for nid in norad_ids)
 
 
+def test_per_satellite_subset_hit(cache):
+    """Test that satellites cached by one query serve a subset query."""
+    test_data = {
+        '25544': {'TLE_LINE1': '1 25544U...', 'TLE_LINE2': '2 25544...'},
+        '48274': {'TLE_LINE1': '1 48274U...', 'TLE_LINE2': '2 48274...'}
+    }
+    cache.set_tle_data([25544, 48274], test_data)
+    
+    retrieved = cache.get_tle_data([48274])
+    assert retrieved == {'48274': test_data['48274']}
+
+
 def test_cache_resilience_no_redis():
     """Test that cache gracefully handles Redis not being available."""
     # Use invalid Redis URL
@@ -0,0 +1,70 @@
+"""
+Tests for the conjunction screens in orbit_agent.py
+Run with: pytest tests/test_conjunctions.py
+"""
+
+import numpy as np
+import pytest
+import orbit_agent
+from orbit_agent import _screen_close_pairs, _screen_close_pairs_numpy
+
+
+THRESHOLD_KM = 50.0
+
+SCREENS = [
+    pytest.param(_screen_close_pairs, id='screen'),
+    pytest.param(_screen_close_pairs_numpy, id='numpy'),
+    pytest.param(
+        orbit_agent._kdtree_close_pairs, id='kdtree',
+        marks=pytest.mark.skipif(not orbit_agent.SCIPY_AVAILABLE, reason='scipy not installed'),
+    ),
+]
+
+
+def _brute_force(pos, threshold_km):
+    """Reference: every pair checked directly, NaN rows never match."""
+    out_i, out_j, out_d = [], [], []
+    for i in range(len(pos)):
+        for j in range(i + 1, len(pos)):
+            d = np.sqrt(np.sum((pos[i] - pos[j]) ** 2))
+            if d < threshold_km:
+                out_i.append(i)
+                out_j.append(j)
+                out_d.append(d)
+    return np.array(out_i, dtype=np.int64), np.array(out_j, dtype=np.int64), np.array(out_d)
+
+
+def _positions(n, seed=0):
+    """Clustered LEO-like positions (km) with a few NaN rows from failed propagations."""
+    rng = np.random.default_rng(seed)
+    direction = rng.normal(size=(n, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    pos = direction * 7000.0
+    # Pull every other point next to its neighbour so there are plenty of hits
+    pos[1::2] = pos[:-1:2][:len(pos[1::2])] + rng.uniform(-40, 40, size=(len(pos[1::2]), 3))
+    pos[rng.choice(n, size=max(n // 20, 1), replace=False)] = np.nan
+    return pos
+
+
+@pytest.mark.parametrize('find_pairs', SCREENS)
+def test_screens_match_brute_force(find_pairs, monkeypatch):
+    """Test every screen returns the brute-force pairs and distances"""
+    # Small tiles so the NumPy screen exercises its off-diagonal blocks
+    monkeypatch.setattr(orbit_agent, 'SCREEN_BLOCK', 64)
+    pos = _positions(300)
+    
+    i, j, d = find_pairs(pos, THRESHOLD_KM)
+    ref_i, ref_j, ref_d = _brute_force(pos, THRESHOLD_KM)
+    
+    assert len(ref_i) > 0
+    np.testing.assert_array_equal(i, ref_i)
+    np.testing.assert_array_equal(j, ref_j)
+    np.testing.assert_allclose(d, ref_d, rtol=1e-12)
+
+
+@pytest.mark.parametrize('find_pairs', SCREENS)
+@pytest.mark.parametrize('n', [0, 1])
+def test_screens_handle_empty_input(find_pairs, n):
+    """Test no satellites (or just one) yields no pairs"""
+    i, j, d = find_pairs(np.zeros((n, 3)), THRESHOLD_KM)
+    assert len(i) == len(j) == len(d) == 0
@@ -3,8 +3,11 @@ Tests for database_manager.py
 Run with: pytest tests/test_database.py
 """
 
+import gc
 import pytest
 import os
+import sqlite3
+import threading
 from database_manager import DatabaseManager
 
 
@@ -101,3 +104,322 @@ def test_bulk_insert(test_db):
     
     stats = test_db.get_statistics()
     assert stats['total_satellites'] == 10
+
+
+def test_bulk_insert_logs_update(test_db):
+    """Test history row written alongside a bulk insert"""
+    satellites = [
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'}
+        for i in range(1, 4)
+    ]
+    
+    test_db.bulk_insert(satellites, log_as="full_sync")
+    
+    history = test_db.get_update_history()
+    assert len(history) == 1
+    assert history[0]['update_type'] == 'full_sync'
+    assert history[0]['satellites_updated'] == 3
+    assert history[0]['status'] == 'success'
+
+
+def test_bulk_insert_isolates_bad_rows(test_db):
+    """Test that one invalid row does not reject the whole batch"""
+    satellites = [
+        {
+            'norad_id': i,
+            'object_name': f'SAT-{i}',
+            'tle_line1': f'1 {i}U...',
+            'tle_line2': f'2 {i}...',
+            'epoch': '2024-001'
+        }
+        for i in range(1, 6)
+    ]
+    del satellites[2]['tle_line1']  # NOT NULL violation
+    
+    success, failed = test_db.bulk_insert(satellites)
+    assert success == 4
+    assert failed == 1
+    assert test_db.get_satellite(3) is None
+    assert test_db.get_statistics()['total_satellites'] == 4
+
+
+def test_bulk_insert_rolls_back_when_locked(test_db):
+    """Test a locked database fails the batch without leaving a transaction open"""
+    satellites = [
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'}
+        for i in range(1, 4)
+    ]
+    test_db._write_conn.execute('PRAGMA busy_timeout=0')
+    
+    other = sqlite3.connect(test_db.db_path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        assert test_db.bulk_insert(satellites) == (0, 3)
+        assert not test_db._write_conn.in_transaction
+    finally:
+        other.rollback()
+        other.close()
+    
+    assert test_db.bulk_insert(satellites) == (3, 0)
+    assert test_db.get_statistics()['total_satellites'] == 3
+
+
+class _BusyOptimizeConnection:
+    """Write connection whose PRAGMA optimize hits SQLITE_BUSY."""
+    
+    def __init__(self, conn):
+        self._conn = conn
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def execute(self, sql, *args):
+        if sql == 'PRAGMA optimize':
+            raise sqlite3.OperationalError('database is locked')
+        return self._conn.execute(sql, *args)
+
+
+def test_bulk_insert_survives_failed_optimize(test_db):
+    """Test a failing PRAGMA optimize does not fail an already committed batch"""
+    satellites = [
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'}
+        for i in range(1, 102)
+    ]
+    conn = test_db._write_conn
+    test_db._write_conn = _BusyOptimizeConnection(conn)
+    try:
+        assert test_db.bulk_insert(satellites) == (101, 0)
+    finally:
+        test_db._write_conn = conn
+    
+    assert test_db.get_statistics()['total_satellites'] == 101
+
+
+def test_bulk_insert_skips_malformed_rows(test_db):
+    """Test a non-dict row is counted as failed instead of aborting the batch"""
+    satellites = [
+        {'norad_id': 1, 'object_name': 'SAT-1', 'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'},
+        None,
+    ]
+    
+    assert test_db.bulk_insert(satellites) == (1, 1)
+    assert not test_db._write_conn.in_transaction
+
+
+def test_search_uses_name_index(test_db):
+    """Test prefix search and that replaced names leave the index"""
+    test_db.bulk_insert([
+        {'norad_id': 44713, 'object_name': 'STARLINK-1007', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'},
+        {'norad_id': 22675, 'object_name': 'COSMOS 2251', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'},
+    ])
+    
+    results = test_db.search_satellites(query='starlink-10')
+    assert [r['norad_id'] for r in results] == [44713]
+    
+    # INSERT OR REPLACE with a new name must drop the old index entry
+    test_db.insert_satellite({'norad_id': 22675, 'object_name': 'COSMOS 2251 DEB',
+                              'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'})
+    assert len(test_db.search_satellites(query='COSMOS')) == 1
+    assert test_db.search_satellites(query='"') == []
+
+
+def test_get_all_norad_ids(test_db):
+    """Test NORAD IDs come back sorted as an int32 array"""
+    test_db.bulk_insert([
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'}
+        for i in (30, 10, 20)
+    ])
+    
+    ids = test_db.get_all_norad_ids()
+    assert ids.dtype == 'int32'
+    assert ids.tolist() == [10, 20, 30]
+
+
+def test_connection_per_thread(test_db):
+    """Test each thread reads through its own connection"""
+    test_db.insert_satellite({'norad_id': 1, 'object_name': 'SAT-1', 'tle_line1': '1',
+                              'tle_line2': '2', 'epoch': '2024-001'})
+    seen = {}
+    
+    def reader():
+        seen['conn'] = test_db.conn
+        seen['sat'] = test_db.get_satellite(1)
+    
+    worker = threading.Thread(target=reader)
+    worker.start()
+    worker.join()
+    
+    assert seen['conn'] is not test_db.conn
+    assert seen['sat']['object_name'] == 'SAT-1'
+
+
+def test_thread_connection_closed_when_thread_exits(test_db):
+    """Test a finished thread's read connection is closed and untracked"""
+    seen = {}
+    
+    def reader():
+        seen['conn'] = test_db.conn
+        test_db.get_statistics()
+    
+    worker = threading.Thread(target=reader)
+    worker.start()
+    worker.join()
+    del worker
+    gc.collect()
+    
+    assert seen['conn'] not in test_db._connections
+    with pytest.raises(sqlite3.ProgrammingError):
+        seen['conn'].execute('SELECT 1')
+
+
+def test_prune_stale(test_db):
+    """Test stale rows are deleted in chunks and fresh rows are kept"""
+    test_db.bulk_insert([
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'}
+        for i in range(1, 8)
+    ])
+    test_db._write_conn.execute(
+        "UPDATE satellites SET updated_at = '2000-01-01T00:00:00' WHERE norad_id <= 5"
+    )
+    
+    assert test_db.prune_stale(days=30, chunk_size=2) == 5
+    assert test_db.get_all_norad_ids().tolist() == [6, 7]
+    assert test_db.search_satellites(query='SAT') != []
+
+
+def test_legacy_updated_at_migrated(tmp_path):
+    """Test CURRENT_TIMESTAMP values from older databases are rewritten to ISO"""
+    db_path = str(tmp_path / 'legacy.db')
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript('''
+        CREATE TABLE satellites (
+            norad_id INTEGER PRIMARY KEY, object_name TEXT NOT NULL,
+            intl_designator TEXT, country TEXT, object_type TEXT, launch_date TEXT,
+            tle_line1 TEXT NOT NULL, tle_line2 TEXT NOT NULL, epoch TEXT NOT NULL,
+            mean_motion REAL, eccentricity REAL, inclination REAL, raan REAL,
+            arg_perigee REAL, mean_anomaly REAL, is_active INTEGER DEFAULT 1,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO satellites (norad_id, object_name, tle_line1, tle_line2, epoch, updated_at)
+        VALUES (1, 'OLD', '1', '2', '2024-001', '2000-01-01 12:00:00');
+    ''')
+    legacy.commit()
+    legacy.close()
+    
+    with DatabaseManager(db_path) as db:
+        assert db.get_satellite(1)['updated_at'] == '2000-01-01T12:00:00.000Z'
+        
+        db.insert_satellite({'norad_id': 2, 'object_name': 'NEW', 'tle_line1': '1',
+                             'tle_line2': '2', 'epoch': '2024-001'})
+        assert db.get_satellite(2)['updated_at'].endswith('Z')
+        
+        assert db.prune_stale(days=30) == 1
+        assert db.get_satellite(2) is not None
+
+
+def test_in_memory_database_shared_across_threads():
+    """Test an in-memory database is visible from every thread"""
+    with DatabaseManager(":memory:") as db:
+        db.insert_satellite({'norad_id': 1, 'object_name': 'SAT-1', 'tle_line1': '1',
+                             'tle_line2': '2', 'epoch': '2024-001'})
+        seen = {}
+        worker = threading.Thread(target=lambda: seen.update(sat=db.get_satellite(1)))
+        worker.start()
+        worker.join()
+        
+        assert seen['sat']['object_name'] == 'SAT-1'
+
+
+def test_search_matches_substrings(test_db):
+    """Test name search matches inside words and handles short terms"""
+    test_db.bulk_insert([
+        {'norad_id': 44713, 'object_name': 'STARLINK-1007', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'},
+        {'norad_id': 25544, 'object_name': 'ISS (ZARYA)', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'},
+    ])
+    
+    assert [r['norad_id'] for r in test_db.search_satellites(query='link')] == [44713]
+    assert [r['norad_id'] for r in test_db.search_satellites(query='ZA')] == [25544]
+
+
+def test_search_column_projection(test_db):
+    """Test search returns list-view columns unless asked for more"""
+    test_db.insert_satellite({'norad_id': 25544, 'object_name': 'ISS (ZARYA)',
+                              'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'})
+    
+    row = test_db.search_satellites(query='ISS')[0]
+    assert 'tle_line1' not in row and row['object_name'] == 'ISS (ZARYA)'
+    
+    row = test_db.search_satellites(query='ISS', columns=('norad_id', 'tle_line2'))[0]
+    assert row == {'norad_id': 25544, 'tle_line2': '2'}
+    
+    assert 'tle_line1' in test_db.search_satellites(query='ISS', columns=None)[0]
+    
+    with pytest.raises(ValueError):
+        test_db.search_satellites(columns=('norad_id; DROP TABLE satellites',))
+
+
+def test_statistics_cache_invalidation(test_db):
+    """Test cached statistics refresh after local and external writes"""
+    assert test_db.get_statistics()['total_satellites'] == 0
+    
+    test_db.insert_satellite({'norad_id': 1, 'object_name': 'SAT-1', 'tle_line1': '1',
+                              'tle_line2': '2', 'epoch': '2024-001'})
+    assert test_db.get_statistics()['total_satellites'] == 1
+    
+    other = sqlite3.connect(test_db.db_path)
+    other.execute("DELETE FROM satellites")
+    other.commit()
+    other.close()
+    assert test_db.get_statistics()['total_satellites'] == 0
+
+
+def test_statistics_cache_isolated_from_callers(test_db):
+    """Test mutating a returned stats dict does not corrupt the cached copy"""
+    test_db.insert_satellite({'norad_id': 1, 'object_name': 'SAT-1', 'country': 'US',
+                              'tle_line1': '1', 'tle_line2': '2', 'epoch': '2024-001'})
+    
+    stats = test_db.get_statistics()
+    stats['top_countries'].append({'country': 'XX', 'count': 99})
+    stats['top_countries'][0]['count'] = 0
+    
+    assert test_db.get_statistics()['top_countries'] == [{'country': 'US', 'count': 1}]
+
+
+def test_get_satellites_batches(test_db):
+    """Test batched lookup across several IN-clause chunks"""
+    test_db.bulk_insert([
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1',
+         'tle_line2': '2', 'epoch': '2024-001'}
+        for i in range(1, 26)
+    ])
+    
+    found = test_db.get_satellites(list(range(1, 31)), chunk_size=7)
+    assert sorted(s['norad_id'] for s in found) == list(range(1, 26))
+    assert test_db.get_satellites([]) == []
+
+
+def test_orbit_class_filter(test_db):
+    """Test the generated orbit_class column and its search filter"""
+    elements = {
+        1: (15.5, 0.0005),   # LEO
+        2: (2.0, 0.01),      # MEO
+        3: (1.0027, 0.0002), # GEO
+        4: (2.0, 0.7),       # HEO
+    }
+    test_db.bulk_insert([
+        {'norad_id': i, 'object_name': f'SAT-{i}', 'tle_line1': '1', 'tle_line2': '2',
+         'epoch': '2024-001', 'mean_motion': mm, 'eccentricity': ecc}
+        for i, (mm, ecc) in elements.items()
+    ])
+    
+    for norad_id, expected in zip(elements, ('LEO', 'MEO', 'GEO', 'HEO')):
+        assert test_db.get_satellite(norad_id)['orbit_class'] == expected
+        found = test_db.search_satellites(orbit_class=expected)
+        assert [s['norad_id'] for s in found] == [norad_id]
@@ -0,0 +1,162 @@
+"""
+Tests for orbit_agent.py
+Run with: pytest tests/test_orbit_agent.py
+"""
+
+import json
+
+import pytest
+import orbit_agent
+
+
+ISS_TLE = {
+    'NORAD_CAT_ID': '25544',
+    'OBJECT_NAME': 'ISS (ZARYA)',
+    'TLE_LINE1': '1 25544U 98067A   24001.50000000  .00016717  00000-0  10270-3 0  9005',
+    'TLE_LINE2': '2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50377579999993',
+}
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload or []).encode()
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+class _FakeSession:
+    """Session whose cookie is rejected (401) on the first instance only."""
+    
+    instances = []
+    
+    def __init__(self):
+        self.expired = not _FakeSession.instances
+        self.gets = []
+        _FakeSession.instances.append(self)
+    
+    def mount(self, prefix, adapter):
+        pass
+    
+    def post(self, url, data=None):
+        return _FakeResponse(200)
+    
+    def get(self, url):
+        self.gets.append(url)
+        return _FakeResponse(401 if self.expired else 200)
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    _FakeSession.instances = []
+    monkeypatch.setattr(orbit_agent.requests, 'Session', _FakeSession)
+    monkeypatch.setattr(orbit_agent, '_SESSIONS', {})
+    return _FakeSession.instances
+
+
+def test_expired_session_relogs_in_once(fake_sessions):
+    """Test a 401 drops the cached session and retries only the rejected queries"""
+    session = orbit_agent._space_track_session('user', 'pass')
+    
+    responses = orbit_agent._space_track_get('user', 'pass', session, ['a', 'b'])
+    
+    assert [r.status_code for r in responses] == [200, 200]
+    assert len(fake_sessions) == 2
+    assert sorted(fake_sessions[1].gets) == ['a', 'b']
+    assert orbit_agent._space_track_session('user', 'pass') is fake_sessions[1]
+
+
+def test_write_csv_uses_lf_line_endings(tmp_path):
+    """Test reports are written with LF line endings on every platform"""
+    path = tmp_path / 'report.csv'
+    orbit_agent._write_csv(path, orbit_agent.PASS_COLUMNS, [('ISS', '2024-01-01 00:00:00', 'AOS (Rise)', 12.3, 10.0)])
+    
+    assert path.read_bytes() == (
+        b'Satellite,UTC Time,Event,Azimuth (deg),Elevation (deg)\n'
+        b'ISS,2024-01-01 00:00:00,AOS (Rise),12.3,10.0\n'
+    )
+
+
+class _FakeCache:
+    """TLE cache that always misses; another worker may hold the refresh lock."""
+    
+    def __init__(self, locked=False, waited=None):
+        self.locked = locked
+        self.waited = waited
+        self.stored = None
+        self.released = []
+    
+    def get_tle_data(self, norad_ids):
+        return None
+    
+    def set_tle_data(self, norad_ids, data):
+        self.stored = data
+    
+    def acquire_refresh_lock(self, norad_ids):
+        return None if self.locked else 'token'
+    
+    def release_refresh_lock(self, norad_ids, token):
+        self.released.append((list(norad_ids), token))
+    
+    def wait_for_tle_data(self, norad_ids):
+        return self.waited
+
+
+class _ForeignCache(_FakeCache):
+    """TLE cache holding records in another producer's layout."""
+    
+    def get_tle_data(self, norad_ids):
+        return {'25544': {'name': 'ISS', 'line1': '', 'line2': ''}}
+
+
+@pytest.fixture
+def space_track_urls(monkeypatch):
+    urls = []
+    
+    def fake_get(username, password, session, queries):
+        urls.extend(queries)
+        return [_FakeResponse(200, [ISS_TLE]) for _ in queries]
+    
+    monkeypatch.setattr(orbit_agent, '_space_track_session', lambda u, p: object())
+    monkeypatch.setattr(orbit_agent, '_space_track_get', fake_get)
+    return urls
+
+
+def test_cache_miss_refreshes_under_lock(space_track_urls):
+    """Test the worker winning the refresh lock fetches, caches and releases it"""
+    cache = _FakeCache()
+    agent = orbit_agent.OrbitGuardAI(cache=cache)
+    
+    assert agent.fetch_tles('user', 'pass', ['25544']) is True
+    
+    assert len(space_track_urls) == 1
+    assert cache.stored['25544']['TLE_LINE1'] == ISS_TLE['TLE_LINE1']
+    assert cache.released == [(['25544'], 'token')]
+
+
+def test_cache_miss_waits_for_lock_holder(space_track_urls):
+    """Test a worker losing the refresh lock uses the winner's cached result"""
+    cache = _FakeCache(locked=True, waited={'25544': {
+        key: ISS_TLE[key] for key in ('OBJECT_NAME', 'TLE_LINE1', 'TLE_LINE2')
+    }})
+    agent = orbit_agent.OrbitGuardAI(cache=cache)
+    
+    assert agent.fetch_tles('user', 'pass', ['25544']) is True
+    
+    assert space_track_urls == []
+    assert cache.released == []
+    assert agent.tle_data == [(ISS_TLE['OBJECT_NAME'], ISS_TLE['TLE_LINE1'], ISS_TLE['TLE_LINE2'])]
+
+
+def test_foreign_cache_records_fall_back_to_live_fetch(space_track_urls):
+    """Test cache records missing the TLE keys are treated as a miss"""
+    urls = space_track_urls
+    cache = _ForeignCache()
+    agent = orbit_agent.OrbitGuardAI(cache=cache)
+    
+    assert agent.fetch_tles('user', 'pass', ['25544']) is True
+    
+    assert len(urls) == 1 and 'NORAD_CAT_ID/25544/' in urls[0]
+    assert agent.tle_data == [(ISS_TLE['OBJECT_NAME'], ISS_TLE['TLE_LINE1'], ISS_TLE['TLE_LINE2'])]
+    assert cache.stored['25544']['OBJECT_NAME'] == 'ISS (ZARYA)'
@@ -0,0 +1,123 @@
+"""
+Tests for orbit_engine.py
+Run with: pytest tests/test_orbit_engine.py
+"""
+
+import numpy as np
+import pytest
+from skyfield.api import EarthSatellite, load
+from orbit_engine import KeplerianEngine, ScientificSatellite
+
+
+ISS_TLE = (
+    "1 25544U 98067A   24001.50000000  .00016717  00000-0  10270-3 0  9005",
+    "2 25544  51.6400 208.9163 0006317  69.9862  25.2906 15.49560532432145",
+)
+STARLINK_TLE = (
+    "1 44713U 19074A   19315.45000000  .00000100  00000-0  10000-3 0  9991",
+    "2 44713  53.0000 100.0000 0001000  90.0000 270.0000 15.00000000  1001",
+)
+
+
+@pytest.fixture
+def ts():
+    return load.timescale()
+
+
+def _satellites(ts, tles):
+    return [ScientificSatellite(EarthSatellite(l1, l2, f'SAT-{k}', ts)) for k, (l1, l2) in enumerate(tles)]
+
+
+def test_prepare_matches_calculate_elements(ts):
+    """Test batched elements agree with per-satellite skyfield propagation"""
+    t = ts.utc(2024, 1, 2, 3, 4, 5.5)
+    batched = _satellites(ts, [ISS_TLE, STARLINK_TLE])
+    single = _satellites(ts, [ISS_TLE, STARLINK_TLE])
+    
+    KeplerianEngine().prepare(batched, t)
+    
+    for b, s in zip(batched, single):
+        expected = s.calculate_elements(t)
+        assert b.has_elements_at(t)
+        for key, value in expected.items():
+            assert b.orbital_elements[key] == pytest.approx(value, rel=1e-9, abs=1e-9)
+        # Cached: a repeat call at the same t returns the same dict
+        assert b.calculate_elements(t) is b.orbital_elements
+
+
+class _ElementsSat:
+    def __init__(self, elements):
+        self.orbital_elements = elements
+    
+    def calculate_elements(self, t):
+        return self.orbital_elements
+
+
+def _random_population(n, seed=0):
+    """Near-circular LEO shells with random planes; two copies force parallel/equal pairs."""
+    rng = np.random.default_rng(seed)
+    rows = np.column_stack([
+        rng.uniform(0, np.pi, n),        # i
+        rng.uniform(0, 2 * np.pi, n),    # om
+        rng.uniform(0, 2 * np.pi, n),    # w
+        rng.uniform(6900, 7100, n),      # a
+        rng.uniform(0, 0.01, n),         # e
+        rng.uniform(0.0010, 0.0012, n),  # n
+    ])
+    rows[1] = rows[0]
+    return rows
+
+
+@pytest.mark.parametrize('batch', ['_pair_nodes', '_pair_nodes_numpy'])
+def test_pair_nodes_match_calculate_conjunction_nodes(batch):
+    """Test batched node geometry agrees with the per-pair method"""
+    engine = KeplerianEngine(tolerance_km=20.0)
+    el = _random_population(60)
+    sats = [_ElementsSat(dict(zip(('i', 'om', 'w', 'a', 'e', 'n'), row))) for row in el]
+    first, second = np.triu_indices(len(el), k=1)
+    
+    parallel, _, _, _, diff_plus, diff_minus, T_c_days = getattr(engine, batch)(el[first], el[second])
+    
+    assert parallel[0]  # the duplicated pair (0, 1)
+    for p, (a, b) in enumerate(zip(first, second)):
+        nodes = engine.calculate_conjunction_nodes(sats[a], sats[b], None)
+        if parallel[p]:
+            assert nodes == []
+            continue
+        expected = [
+            diff for diff in (diff_plus[p], diff_minus[p])
+            if diff <= engine.tolerance_km and T_c_days[p] >= 0.2
+        ]
+        assert [node['distance_diff_km'] for node in nodes] == pytest.approx(expected, abs=1e-9)
+        for node in nodes:
+            assert node['T_c_days'] == pytest.approx(T_c_days[p], rel=1e-12)
+
+
+def test_population_criticality_matches_pairwise():
+    """Test batched criticality equals summing per-pair nodes"""
+    engine = KeplerianEngine(tolerance_km=20.0)
+    el = _random_population(80, seed=1)
+    make = lambda: [_ElementsSat(dict(zip(('i', 'om', 'w', 'a', 'e', 'n'), row))) for row in el]
+    batched, pairwise = make(), make()
+    
+    engine.calculate_population_criticality(batched, None)
+    
+    expected = np.zeros(len(el))
+    for a in range(len(el)):
+        for b in range(a + 1, len(el)):
+            for node in engine.calculate_conjunction_nodes(pairwise[a], pairwise[b], None):
+                expected[a] += node['f_nc']
+                expected[b] += node['f_nc']
+    assert expected.sum() > 0
+    np.testing.assert_allclose([s.criticality_score for s in batched], expected, rtol=1e-9)
+
+
+def test_prepare_marks_sgp4_failures_nan(ts):
+    """Test satellites SGP4 cannot propagate get NaN elements"""
+    t = ts.utc(2034, 1, 2)  # long after this ISS TLE has decayed
+    sats = _satellites(ts, [ISS_TLE, STARLINK_TLE])
+    
+    KeplerianEngine().prepare(sats, t)
+    
+    assert np.isnan(sats[0].orbital_elements['a'])
+    assert np.isfinite(sats[1].orbital_elements['a'])
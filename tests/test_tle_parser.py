@@ -0,0 +1,56 @@
+"""
+Tests for tle_parser.py
+Run with: pytest tests/test_tle_parser.py
+"""
+
+import numpy as np
+import pytest
+import tle_parser
+from tle_parser import parse_tle_batch, ELEMENT_FIELDS
+
+
+ISS_LINE2 = '2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.48919393000000'
+
+
+def test_parse_single_line():
+    """Test elements are read from the fixed TLE columns"""
+    elements = parse_tle_batch([ISS_LINE2])
+    assert elements.shape == (1, len(ELEMENT_FIELDS))
+    
+    parsed = dict(zip(ELEMENT_FIELDS, elements[0]))
+    assert parsed['inclination'] == 51.6416
+    assert parsed['raan'] == 247.4627
+    assert parsed['eccentricity'] == 0.0006703
+    assert parsed['arg_perigee'] == 130.5360
+    assert parsed['mean_anomaly'] == 325.0288
+    assert parsed['mean_motion'] == 15.48919393
+
+
+def test_malformed_lines_are_nan():
+    """Test malformed rows come back as NaN without affecting others"""
+    bad = ISS_LINE2.replace('51.6416', '51.64x6')
+    elements = parse_tle_batch([bad, '', ISS_LINE2, '1 25544U'])
+    
+    assert np.isnan(elements[[0, 1, 3]]).all()
+    assert not np.isnan(elements[2]).any()
+
+
+def test_empty_batch():
+    """Test empty input returns an empty matrix"""
+    assert parse_tle_batch([]).shape == (0, len(ELEMENT_FIELDS))
+
+
+@pytest.mark.skipif(not tle_parser.NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_matches_python_fallback():
+    """Test the JIT kernel agrees with the pure-Python parser"""
+    rng = np.random.default_rng(0)
+    lines = [
+        '2 %05d %8.4f %8.4f %07d %8.4f %8.4f %11.8f%5d0' % (
+            i, *rng.uniform(0, 180, 2), rng.integers(0, 9999999),
+            *rng.uniform(0, 360, 2), rng.uniform(0.5, 17), i
+        )
+        for i in range(500)
+    ]
+    
+    expected = np.array([tle_parser._parse_line2(line) for line in lines])
+    assert np.array_equal(parse_tle_batch(lines), expected)
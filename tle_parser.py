@@ -0,0 +1,116 @@
+"""
+TLE Parser for OrbitGuard AI
+Batch extraction of Keplerian elements from TLE line 2 text
+"""
+
+from typing import Sequence
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Column order of the matrix returned by parse_tle_batch
+ELEMENT_FIELDS = ('inclination', 'raan', 'eccentricity', 'arg_perigee', 'mean_anomaly', 'mean_motion')
+
+# (start, end) 0-based slices of each element on TLE line 2, same order as ELEMENT_FIELDS
+_LINE2_SLICES = ((8, 16), (17, 25), (26, 33), (34, 42), (43, 51), (52, 63))
+_ECC_FIELD = 2  # stored with an implied leading decimal point
+_LINE_WIDTH = 69
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _parse_field(row, start, end, implied_point):
+        """Parses one fixed-width ASCII decimal field; NaN if malformed."""
+        value = 0.0
+        scale = 1.0
+        sign = 1.0
+        digits = 0
+        seen_point = False
+        for k in range(start, end):
+            c = row[k]
+            if c == 32:  # space padding
+                continue
+            if c == 45:  # '-'
+                sign = -1.0
+            elif c == 43:  # '+'
+                pass
+            elif c == 46:  # '.'
+                if seen_point:
+                    return np.nan
+                seen_point = True
+            elif 48 <= c <= 57:
+                value = value * 10.0 + (c - 48)
+                digits += 1
+                if seen_point:
+                    scale *= 10.0
+            else:
+                return np.nan
+        if digits == 0:
+            return np.nan
+        if implied_point:
+            scale = 10.0 ** digits
+        return sign * value / scale
+
+    @numba.njit(cache=True, parallel=True)
+    def _parse_matrix(buf, slices, ecc_field):
+        """Parses an (N, 69) uint8 matrix of line-2 text into (N, 6) float64."""
+        n = buf.shape[0]
+        out = np.empty((n, slices.shape[0]), np.float64)
+        for i in numba.prange(n):
+            valid = buf[i, 0] == 50  # line number '2'
+            for j in range(slices.shape[0]):
+                v = _parse_field(buf[i], slices[j, 0], slices[j, 1], j == ecc_field)
+                if np.isnan(v):
+                    valid = False
+                out[i, j] = v
+            if not valid:
+                out[i, :] = np.nan
+        return out
+
+
+def _parse_line2(line: str):
+    """Pure-Python fallback for a single line; None if malformed."""
+    if not line or line[0] != '2' or len(line) < _LINE2_SLICES[-1][1]:
+        return None
+    try:
+        return tuple(
+            float('0.' + line[a:b].strip()) if j == _ECC_FIELD else float(line[a:b])
+            for j, (a, b) in enumerate(_LINE2_SLICES)
+        )
+    except ValueError:
+        return None
+
+
+def parse_tle_batch(lines2: Sequence[str]) -> np.ndarray:
+    """
+    Extract Keplerian elements from many TLE line-2 strings at once.
+    
+    Args:
+        lines2: TLE second lines (fixed-width, per the NORAD TLE format)
+        
+    Returns:
+        float64 array of shape (N, 6) in ELEMENT_FIELDS order. Rows for
+        malformed lines are all NaN.
+    """
+    n = len(lines2)
+    if n == 0:
+        return np.empty((0, len(ELEMENT_FIELDS)), np.float64)
+    
+    if NUMBA_AVAILABLE:
+        packed = b''.join(
+            (line or '').encode('ascii', 'replace')[:_LINE_WIDTH].ljust(_LINE_WIDTH)
+            for line in lines2
+        )
+        buf = np.frombuffer(packed, dtype=np.uint8).reshape(n, _LINE_WIDTH)
+        return _parse_matrix(buf, np.array(_LINE2_SLICES, np.int64), _ECC_FIELD)
+    
+    out = np.full((n, len(ELEMENT_FIELDS)), np.nan)
+    for i, line in enumerate(lines2):
+        row = _parse_line2(line)
+        if row is not None:
+            out[i] = row
+    return out